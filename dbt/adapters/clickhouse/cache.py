@@ -1,7 +1,9 @@
+import sys
 import threading
 from collections import namedtuple
 from copy import deepcopy
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 from dbt.adapters.events.types import CacheAction, CacheDumpGraph
 from dbt.adapters.exceptions import (
@@ -13,6 +15,14 @@ from dbt_common.events.functions import fire_event, fire_event_if
 
 ReferenceKey = namedtuple("ReferenceKey", "schema identifier")
 
+# Shared by all cached relations without references
+_NO_REFERRERS: Mapping = MappingProxyType({})
+_NO_REFERENCES: AbstractSet = frozenset()
+
+
+def _intern(name: Optional[str]) -> Optional[str]:
+    return None if name is None else sys.intern(name)
+
 
 def dot_separated(key: ReferenceKey) -> str:
     """Return the key in dot-separated string form.
@@ -25,39 +35,88 @@ def dot_separated(key: ReferenceKey) -> str:
 class CachedRelation:
     """Nothing about _CachedRelation is guaranteed to be thread-safe!
 
-    :attr str database: The schema of this relation.
+    Entries use slots and interned names, since large projects cache hundreds
+    of thousands of them. Entries added from a schema listing only keep the
+    relation attributes, and build the underlying relation the first time it
+    is needed. The reference containers are only allocated once used.
+
+    :attr str schema: The schema of this relation.
     :attr str identifier: The identifier of this relation.
     :attr Dict[ReferenceKey, CachedRelation] referenced_by: The relations
         that refer to this relation.
+    :attr Set[ReferenceKey] references: The relations this relation refers to.
     :attr BaseRelation inner: The underlying dbt relation.
     """
 
-    def __init__(self, inner):
-        self.referenced_by = {}
-        self.inner = inner
+    __slots__ = (
+        "schema",
+        "identifier",
+        "_inner",
+        "_build",
+        "_attrs",
+        "_referenced_by",
+        "_references",
+    )
+
+    def __init__(self, inner=None, schema=None, identifier=None, build=None, attrs=None):
+        if inner is not None:
+            schema, identifier = inner.schema, inner.identifier
+        self.schema: Optional[str] = _intern(schema)
+        self.identifier: Optional[str] = _intern(identifier)
+        self._inner = inner
+        # Called with the schema, identifier and attrs to build a relation that isn't built yet
+        self._build: Optional[Callable[[Optional[str], Optional[str], Any], Any]] = build
+        self._attrs = attrs
+        self._referenced_by: Optional[Dict[ReferenceKey, CachedRelation]] = None
+        self._references: Optional[Set[ReferenceKey]] = None
 
     def __str__(self) -> str:
         return "CachedRelation(schema={}, identifier={}, inner={})".format(
-            self.schema, self.identifier, self.inner
+            self.schema, self.identifier, self._inner
         )
 
     @property
-    def schema(self) -> Optional[str]:
-        return self.inner.schema
+    def inner(self):
+        if self._inner is None and self._build is not None:
+            self._inner = self._build(self.schema, self.identifier, self._attrs)
+        return self._inner
+
+    @inner.setter
+    def inner(self, inner) -> None:
+        self._inner = inner
+        self._build = self._attrs = None
 
     @property
-    def identifier(self) -> Optional[str]:
-        return self.inner.identifier
+    def is_built(self) -> bool:
+        return self._inner is not None
 
-    def __copy__(self):
-        new = self.__class__(self.inner)
-        new.__dict__.update(self.__dict__)
+    @property
+    def referenced_by(self) -> Mapping[ReferenceKey, "CachedRelation"]:
+        return _NO_REFERRERS if self._referenced_by is None else self._referenced_by
+
+    @property
+    def references(self) -> AbstractSet[ReferenceKey]:
+        return _NO_REFERENCES if self._references is None else self._references
+
+    def _copy_state(self, new: "CachedRelation") -> "CachedRelation":
+        new._build, new._attrs = self._build, self._attrs
+        new._referenced_by = None if self._referenced_by is None else dict(self._referenced_by)
+        new._references = None if self._references is None else set(self._references)
         return new
 
+    def __copy__(self):
+        return self._copy_state(
+            self.__class__(self._inner, schema=self.schema, identifier=self.identifier)
+        )
+
     def __deepcopy__(self, memo):
-        new = self.__class__(self.inner.incorporate())
-        new.__dict__.update(self.__dict__)
-        new.referenced_by = deepcopy(self.referenced_by, memo)
+        inner = None if self._inner is None else self._inner.incorporate()
+        new = self._copy_state(
+            self.__class__(inner, schema=self.schema, identifier=self.identifier)
+        )
+        if self._referenced_by is not None:
+            new._referenced_by = deepcopy(self._referenced_by, memo)
+        return new
 
     def is_referenced_by(self, key):
         return key in self.referenced_by
@@ -75,18 +134,37 @@ class CachedRelation:
 
         :param _CachedRelation referrer: The node that refers to this node.
         """
-        self.referenced_by[referrer.key()] = referrer
+        if self._referenced_by is None:
+            self._referenced_by = {}
+        self._referenced_by[referrer.key()] = referrer
+        referrer.add_reference_key(self.key())
+
+    def add_reference_key(self, key: ReferenceKey) -> None:
+        """Record that this relation refers to the relation named key"""
+        if self._references is None:
+            self._references = set()
+        self._references.add(key)
+
+    def discard_reference_key(self, key: ReferenceKey) -> None:
+        if self._references is not None:
+            self._references.discard(key)
 
     def collect_consequences(self):
-        """Recursively collect a set of _ReferenceKeys that would
-        consequentially get dropped if this were dropped via
-        "drop ... cascade".
+        """Collect the set of _ReferenceKeys that directly or transitively
+        depend on this relation, including this relation itself. Reference
+        cycles are followed only once.
 
-        :return Set[_ReferenceKey]: All the relations that would be dropped
+        :return Set[_ReferenceKey]: All the dependent relations
         """
         consequences = {self.key()}
-        for relation in self.referenced_by.values():
-            consequences.update(relation.collect_consequences())
+        pending = list(self.referenced_by.values())
+        while pending:
+            relation = pending.pop()
+            key = relation.key()
+            if key in consequences:
+                continue
+            consequences.add(key)
+            pending.extend(relation.referenced_by.values())
         return consequences
 
     def release_references(self, keys):
@@ -95,9 +173,11 @@ class CachedRelation:
 
         :param Iterable[_ReferenceKey] keys: The keys to drop.
         """
-        keys = set(self.referenced_by) & set(keys)
+        if self._referenced_by is None:
+            return
+        keys = set(self._referenced_by) & set(keys)
         for key in keys:
-            self.referenced_by.pop(key)
+            self._referenced_by.pop(key)
 
     def rename(self, new_relation):
         """Rename this cached relation to new_relation.
@@ -114,6 +194,7 @@ class CachedRelation:
         self.inner = self.inner.incorporate(
             path={"identifier": new_relation.inner.identifier},
         )
+        self.identifier = new_relation.identifier
 
     def rename_key(self, old_key, new_key):
         """Rename a reference that may or may not exist. Only handles the
@@ -128,10 +209,10 @@ class CachedRelation:
         if new_key in self.referenced_by:
             raise NewNameAlreadyInCacheError(old_key, new_key)
 
-        if old_key not in self.referenced_by:
+        if self._referenced_by is None or old_key not in self._referenced_by:
             return
-        value = self.referenced_by.pop(old_key)
-        self.referenced_by[new_key] = value
+        value = self._referenced_by.pop(old_key)
+        self._referenced_by[new_key] = value
 
     def dump_graph_entry(self):
         """Return a key/value pair representing this key and its referents.
@@ -149,10 +230,39 @@ class ClickHouseRelationsCache:
     :attr threading.RLock lock: The lock around relations, held during updates.
         The adapters also hold this lock while filling the cache.
     :attr Set[str] schemas: The set of known/cached schemas
+    :attr Dict[str, Dict[_ReferenceKey, _CachedRelation]] schema_relations: The
+        known relations, indexed by schema.
+
+    Lookups by schema read an immutable snapshot of the schema's relations
+    without taking the lock. Any change to a schema discards its snapshot,
+    and the next lookup builds a new one under the lock.
+
+    The cache also holds the columns of relations, which are discarded when
+    a relation is added, dropped or renamed, or when the adapter runs a DDL
+    statement for it.
+
+    Relations in schemas that aren't cached can be added individually after a
+    point lookup without marking their schema as cached, and relations known
+    not to exist are remembered until a relation with the same name is added
+    or changed by a DDL statement.
+
+    The database catalog (the ClickHouse databases, with their engines and
+    comments) is loaded by the adapter on first use, and then maintained as
+    the adapter creates and drops databases.
     """
 
     def __init__(self, log_cache_events: bool = False) -> None:
         self.relations: Dict[ReferenceKey, CachedRelation] = {}
+        self.schema_relations: Dict[Optional[str], Dict[ReferenceKey, CachedRelation]] = {}
+        self._schema_snapshots: Dict[Optional[str], Tuple[Any, ...]] = {}
+        self._columns: Dict[ReferenceKey, List[Any]] = {}
+        self._missing: Set[ReferenceKey] = set()
+        self._shared_attrs: Dict[Any, Any] = {}
+        # Incremented whenever columns are invalidated, so that columns (or missing relations)
+        # read concurrently with the invalidation are not stored
+        self.columns_epoch = 0
+        self._databases: Optional[Dict[str, Any]] = None
+        self.databases_epoch = 0
         self.lock = threading.RLock()
         self.schemas: Set[Optional[str]] = set()
         self.log_cache_events = log_cache_events
@@ -190,6 +300,8 @@ class ClickHouseRelationsCache:
             self._remove_all(to_remove)
             # handle a drop_schema race by using discard() over remove()
             self.schemas.discard(key)
+            self.schema_relations.pop(key, None)
+            self._schema_snapshots.pop(key, None)
 
     def update_schemas(self, schemas: Iterable[Tuple[Optional[str], str]]):
         """Add multiple schemas to the set of known schemas
@@ -226,7 +338,28 @@ class ClickHouseRelationsCache:
         """
         self.add_schema(None, relation.schema)
         key = relation.key()
-        return self.relations.setdefault(key, relation)
+        existing = self.relations.get(key)
+        if existing is not None:
+            return existing
+        self._index(key, relation)
+        return relation
+
+    def _index(self, key: ReferenceKey, relation: CachedRelation):
+        """Store a relation under key. Callers should hold the lock."""
+        self.relations[key] = relation
+        self.schema_relations.setdefault(key.schema, {})[key] = relation
+        self._schema_snapshots.pop(key.schema, None)
+        self._invalidate_columns([key])
+
+    def _unindex(self, key: ReferenceKey) -> CachedRelation:
+        """Remove and return the relation stored under key. Callers should hold the lock."""
+        relation = self.relations.pop(key)
+        self._schema_snapshots.pop(key.schema, None)
+        self._invalidate_columns([key])
+        schema_relations = self.schema_relations.get(key.schema)
+        if schema_relations is not None:
+            schema_relations.pop(key, None)
+        return relation
 
     def add(self, relation):
         """Add the relation inner to the cache
@@ -247,6 +380,55 @@ class ClickHouseRelationsCache:
             lambda: CacheDumpGraph(before_after="after", action="adding", dump=self.dump_graph()),
         )
 
+    def add_listed(
+        self,
+        schema: str,
+        identifier: str,
+        build: Callable[[Optional[str], Optional[str], Any], Any],
+        attrs: Any,
+    ) -> None:
+        """Add a relation from a schema listing, which is only built by calling
+        build(schema, identifier, attrs) once it's needed. The attrs should be
+        hashable, since equal attrs are shared between relations.
+        """
+        attrs = self._shared_attrs.setdefault(attrs, attrs)
+        cached = CachedRelation(schema=schema, identifier=identifier, build=build, attrs=attrs)
+        fire_event(CacheAction(action="add_relation", ref_key=_make_ref_key_dict(cached)))
+        with self.lock:
+            self._setdefault(cached)
+
+    def add_looked_up(self, relation) -> None:
+        """Add a relation found outside of a schema listing, without marking its
+        schema as cached.
+
+        :param BaseRelation relation: The underlying relation.
+        """
+        cached = CachedRelation(relation)
+        fire_event(CacheAction(action="add_relation", ref_key=_make_ref_key_dict(cached)))
+        with self.lock:
+            key = cached.key()
+            if key not in self.relations:
+                self._index(key, cached)
+
+    def get_cached_relation(self, schema: Optional[str], identifier: str) -> Optional[Any]:
+        """Return the cached relation with the given name, or None"""
+        cached = self.relations.get(ReferenceKey(schema, identifier))
+        if cached is None:
+            return None
+        if not cached.is_built:
+            with self.lock:
+                return cached.inner
+        return cached.inner
+
+    def add_missing(self, schema: Optional[str], identifier: str, epoch: int) -> None:
+        """Record that the relation doesn't exist, as read when columns_epoch was epoch"""
+        with self.lock:
+            if epoch == self.columns_epoch:
+                self._missing.add(ReferenceKey(schema, identifier))
+
+    def is_missing(self, schema: Optional[str], identifier: str) -> bool:
+        return ReferenceKey(schema, identifier) in self._missing
+
     def _remove_refs(self, keys):
         """Removes all references to all entries in keys. This does not
         cascade!
@@ -254,15 +436,60 @@ class ClickHouseRelationsCache:
         :param Iterable[_ReferenceKey] keys: The keys to remove.
         """
         # remove direct refs
-        for key in keys:
-            del self.relations[key]
-        # then remove all entries from each child
-        for cached in self.relations.values():
-            cached.release_references(keys)
+        removed = [self._unindex(key) for key in keys]
+        # then remove all entries from each relation the removed relations referred to
+        for relation in removed:
+            for referenced_key in relation.references:
+                referenced = self.relations.get(referenced_key)
+                if referenced is not None:
+                    referenced.release_references(keys)
+            # and the references of any surviving dependents
+            for referrer in relation.referenced_by.values():
+                referrer.discard_reference_key(relation.key())
+
+    def add_link(self, referenced, dependent):
+        """Add a link between two cached relations, where dependent refers
+        to referenced (for example a materialized view reading from a table).
+        Links involving relations that aren't cached are ignored.
+
+        :param BaseRelation referenced: The referenced relation.
+        :param BaseRelation dependent: The dependent relation.
+        """
+        ref_key = _make_ref_key(referenced)
+        dep_key = _make_ref_key(dependent)
+        with self.lock:
+            referenced_relation = self.relations.get(ref_key)
+            dependent_relation = self.relations.get(dep_key)
+            if referenced_relation is None or dependent_relation is None:
+                return
+            referenced_relation.add_reference(dependent_relation)
+        fire_event(
+            CacheAction(action="add_link", ref_key=dep_key._asdict(), ref_key_2=ref_key._asdict())
+        )
+
+    def get_dependents(self, relation) -> List[Any]:
+        """Return the cached relations that directly or transitively depend
+        on relation.
+
+        :param BaseRelation relation: The referenced relation.
+        """
+        key = _make_ref_key(relation)
+        with self.lock:
+            cached = self.relations.get(key)
+            if cached is None:
+                return []
+            return [
+                self.relations[dependent].inner
+                for dependent in cached.collect_consequences() - {key}
+                if dependent in self.relations
+            ]
 
     def drop(self, relation):
-        """Drop the named relation and cascade it appropriately to all
-        dependent relations.
+        """Drop the named relation.
+
+        Dropping a relation in ClickHouse never drops the relations that depend
+        on it (a materialized view outlives its source table), so unlike other
+        adapters the drop doesn't cascade to dependent relations.
 
         Because dbt proactively does many `drop relation if exist ... cascade`
         that are noops, nonexistent relation drops cause a debug log and no
@@ -276,17 +503,10 @@ class ClickHouseRelationsCache:
         fire_event(CacheAction(action="drop_relation", ref_key=dropped_key_msg))
         with self.lock:
             if dropped_key not in self.relations:
+                self._invalidate_columns([dropped_key])
                 fire_event(CacheAction(action="drop_missing_relation", ref_key=dropped_key_msg))
                 return
-            consequences = self.relations[dropped_key].collect_consequences()
-            # convert from a list of _ReferenceKeys to a list of ReferenceKeyMsgs
-            consequence_msgs = [key._asdict() for key in consequences]
-            fire_event(
-                CacheAction(
-                    action="drop_cascade", ref_key=dropped_key_msg, ref_list=consequence_msgs
-                )
-            )
-            self._remove_refs(consequences)
+            self._remove_refs([dropped_key])
 
     def _rename_relation(self, old_key, new_relation):
         """Rename a relation named old_key to new_key, updating references.
@@ -299,14 +519,19 @@ class ClickHouseRelationsCache:
         # previously referenced by old_name to be referenced by new_name.
         # basically, the name changes but some underlying ID moves. Kind of
         # like an object reference!
-        relation = self.relations.pop(old_key)
+        relation = self._unindex(old_key)
         new_key = new_relation.key()
 
         # relation has to rename its innards, so it needs the _CachedRelation.
         relation.rename(new_relation)
-        # update all the relations that refer to it
-        for cached in self.relations.values():
-            if cached.is_referenced_by(old_key):
+        # update the relations that refer to it
+        for referrer in relation.referenced_by.values():
+            referrer.discard_reference_key(old_key)
+            referrer.add_reference_key(new_key)
+        # and the relations it refers to
+        for referenced_key in relation.references:
+            cached = self.relations.get(referenced_key)
+            if cached is not None and cached.is_referenced_by(old_key):
                 fire_event(
                     CacheAction(
                         action="update_reference",
@@ -318,7 +543,7 @@ class ClickHouseRelationsCache:
 
                 cached.rename_key(old_key, new_key)
 
-        self.relations[new_key] = relation
+        self._index(new_key, relation)
         # also fixup the schemas!
         self.add_schema(None, new_key.schema)
 
@@ -373,6 +598,7 @@ class ClickHouseRelationsCache:
         )
 
         with self.lock:
+            self._invalidate_columns([old_key, new_key])
             if self._check_rename_constraints(old_key, new_key):
                 self._rename_relation(old_key, CachedRelation(new))
             else:
@@ -385,8 +611,12 @@ class ClickHouseRelationsCache:
 
     def get_relations(self, _database: Optional[str], schema: Optional[str]) -> List[Any]:
         """Yield all relations matching the given schema (ClickHouse database)."""
-        with self.lock:
-            results = [r.inner for r in self.relations.values() if r.schema == schema]
+        snapshot = self._schema_snapshots.get(schema)
+        if snapshot is None:
+            with self.lock:
+                snapshot = tuple(r.inner for r in self.schema_relations.get(schema, {}).values())
+                self._schema_snapshots[schema] = snapshot
+        results = list(snapshot)
 
         if None in results:
             raise NoneRelationFoundError()
@@ -396,17 +626,96 @@ class ClickHouseRelationsCache:
         """Clear the cache"""
         with self.lock:
             self.relations.clear()
+            self.schema_relations.clear()
+            self._schema_snapshots.clear()
+            self._invalidate_columns()
+            self._invalidate_databases()
             self.schemas.clear()
 
+    def get_columns(self, relation) -> Optional[List[Any]]:
+        """Return the cached columns of relation, or None if they aren't cached"""
+        columns = self._columns.get(_make_ref_key(relation))
+        return None if columns is None else list(columns)
+
+    def set_columns(self, relation, columns: List[Any], epoch: int) -> None:
+        """Cache the columns of relation, read when columns_epoch was epoch"""
+        if relation.schema is None:
+            return
+        with self.lock:
+            if epoch == self.columns_epoch:
+                self._columns[_make_ref_key(relation)] = list(columns)
+
+    def invalidate_columns(
+        self, names: Optional[Iterable[Tuple[Optional[str], str]]] = None
+    ) -> None:
+        """Discard the cached columns of the (schema, identifier) names, where a
+        None schema matches any schema. All columns are discarded if names is None.
+        The names are also no longer known to be missing.
+        """
+        with self.lock:
+            if names is None:
+                self._invalidate_columns()
+                return
+            keys: List[ReferenceKey] = []
+            for schema, identifier in names:
+                if schema is None:
+                    keys.extend(
+                        key
+                        for key in (*self._columns, *self._missing)
+                        if key.identifier == identifier
+                    )
+                else:
+                    keys.append(ReferenceKey(schema, identifier))
+            self._invalidate_columns(keys)
+
+    def _invalidate_columns(self, keys: Optional[Iterable[ReferenceKey]] = None) -> None:
+        """Callers should hold the lock."""
+        self.columns_epoch += 1
+        if keys is None:
+            self._columns.clear()
+            self._missing.clear()
+        else:
+            for key in keys:
+                self._columns.pop(key, None)
+                self._missing.discard(key)
+
+    def get_databases(self) -> Optional[Dict[str, Any]]:
+        """Return the database catalog by name, or None if it isn't loaded"""
+        return self._databases
+
+    def set_databases(self, databases: Iterable[Any], epoch: int) -> None:
+        """Replace the database catalog, read when databases_epoch was epoch"""
+        with self.lock:
+            if epoch == self.databases_epoch:
+                self._databases = {database.name: database for database in databases}
+
+    def add_database(self, database: Any) -> None:
+        """Add or replace a database in the catalog, if the catalog is loaded"""
+        with self.lock:
+            self.databases_epoch += 1
+            if self._databases is not None:
+                self._databases = {**self._databases, database.name: database}
+
+    def remove_database(self, name: str) -> None:
+        with self.lock:
+            self.databases_epoch += 1
+            if self._databases is not None and name in self._databases:
+                self._databases = {
+                    key: database for key, database in self._databases.items() if key != name
+                }
+
+    def invalidate_databases(self) -> None:
+        with self.lock:
+            self._invalidate_databases()
+
+    def _invalidate_databases(self) -> None:
+        """Callers should hold the lock."""
+        self.databases_epoch += 1
+        self._databases = None
+
     def _list_relations_in_schema(self, schema: Optional[str]) -> List[CachedRelation]:
         """Get the relations in a schema. Callers should hold the lock."""
-        key = schema
-
-        to_remove: List[CachedRelation] = []
-        for cachekey, relation in self.relations.items():
-            if cachekey.schema == key:
-                to_remove.append(relation)
-        return to_remove
+        return list(self.schema_relations.get(schema, {}).values())
 
     def _remove_all(self, to_remove: List[CachedRelation]):
         """Remove all the listed relations. Ignore relations that have been
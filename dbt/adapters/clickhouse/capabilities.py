@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from dbt.adapters.clickhouse.logger import logger
+from dbt.adapters.clickhouse.util import atomic_write_json
+
+
+@dataclass
+class ServerCapabilities:
+    """
+    Results of the connection setup probes for one server/user/database combination.
+    """
+
+    server_version: str
+    has_lw_deletes: bool
+    use_lw_deletes: bool
+    atomic_exchange: bool
+    # Settings that the lightweight delete probe enabled for the connection
+    conn_settings: Dict[str, str] = field(default_factory=dict)
+    probed_at: float = field(default_factory=time.time)
+
+
+class CapabilityRegistry:
+    """
+    Process-wide cache of ServerCapabilities shared by all connections (and so all dbt threads).
+
+    Each key is probed at most once per process. Concurrent connections for the same key wait
+    for the first probe to finish instead of repeating it. If a cache file is configured,
+    probe results are also persisted to disk and reused by later dbt invocations until they
+    are older than the configured TTL.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._probe_locks: Dict[str, threading.Lock] = {}
+        self._capabilities: Dict[str, ServerCapabilities] = {}
+        self._databases: Set[Tuple[str, str]] = set()
+        self._loaded_files: Set[str] = set()
+
+    def get_or_probe(
+        self,
+        key: str,
+        probe: Callable[[], ServerCapabilities],
+        cache_path: Optional[str] = None,
+        ttl: int = 0,
+    ) -> ServerCapabilities:
+        if cache_path:
+            self._load_file(cache_path, ttl)
+        with self._lock:
+            cached = self._capabilities.get(key)
+            if cached is not None:
+                return cached
+            probe_lock = self._probe_locks.setdefault(key, threading.Lock())
+        with probe_lock:
+            with self._lock:
+                cached = self._capabilities.get(key)
+            if cached is not None:
+                return cached
+            capabilities = probe()
+            with self._lock:
+                self._capabilities[key] = capabilities
+            if cache_path:
+                self._save_file(cache_path, key, capabilities, ttl)
+            return capabilities
+
+    def database_ensured(self, server_key: str, database: str) -> bool:
+        with self._lock:
+            return (server_key, database) in self._databases
+
+    def add_database(self, server_key: str, database: str) -> None:
+        with self._lock:
+            self._databases.add((server_key, database))
+
+    def database_dropped(self, database: str) -> None:
+        """Forget everything probed against a database that no longer exists"""
+        with self._lock:
+            self._databases = {entry for entry in self._databases if entry[1] != database}
+            suffix = f'|{database}|'
+            for key in [key for key in self._capabilities if suffix in key]:
+                del self._capabilities[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._capabilities.clear()
+            self._databases.clear()
+            self._loaded_files.clear()
+
+    def _load_file(self, cache_path: str, ttl: int) -> None:
+        with self._lock:
+            if cache_path in self._loaded_files:
+                return
+            self._loaded_files.add(cache_path)
+            entries = _read_cache_file(cache_path)
+            now = time.time()
+            for key, entry in entries.items():
+                try:
+                    capabilities = ServerCapabilities(**entry)
+                except TypeError:
+                    continue
+                if ttl <= 0 or now - capabilities.probed_at > ttl:
+                    continue
+                self._capabilities.setdefault(key, capabilities)
+
+    def _save_file(
+        self, cache_path: str, key: str, capabilities: ServerCapabilities, ttl: int
+    ) -> None:
+        with self._lock:
+            now = time.time()
+            entries = {
+                k: v
+                for k, v in _read_cache_file(cache_path).items()
+                if ttl > 0 and now - v.get('probed_at', 0) <= ttl
+            }
+            entries[key] = asdict(capabilities)
+            try:
+                atomic_write_json(cache_path, entries)
+            except OSError as ex:
+                logger.debug(f'Unable to write ClickHouse capability cache {cache_path}: {ex}')
+
+
+def _read_cache_file(cache_path: str) -> Dict[str, Dict]:
+    try:
+        with open(cache_path) as f:
+            entries = json.load(f)
+        return entries if isinstance(entries, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+capability_registry = CapabilityRegistry()
@@ -1,12 +1,65 @@
-import re
 from dataclasses import dataclass, field
-from typing import Any, List, Literal, TypeVar
+from functools import lru_cache
+from typing import Any, List, Literal, NamedTuple, Optional, TypeVar
 
 from dbt.adapters.base.column import Column
 from dbt_common.exceptions import DbtRuntimeError
 
+from dbt.adapters.clickhouse.datatype import ChType, parse_type
+
 Self = TypeVar('Self', bound='ClickHouseColumn')
 
+# Precision of the DecimalN(S) types
+_DECIMAL_PRECISION = {'Decimal32': 9, 'Decimal64': 18, 'Decimal128': 38, 'Decimal256': 76}
+
+
+class _ColumnType(NamedTuple):
+    dtype: str
+    is_nullable: bool
+    is_low_cardinality: bool
+    char_size: Optional[int]
+    numeric_precision: Optional[int]
+    numeric_scale: Optional[int]
+
+
+@lru_cache(maxsize=4096)
+def _column_type(type_str: str) -> _ColumnType:
+    ch_type = parse_type(type_str)
+    is_low_cardinality = ch_type.low_cardinality and bool(ch_type.type_params)
+    if is_low_cardinality:
+        ch_type = ch_type.type_params[0]
+    is_nullable = ch_type.nullable and bool(ch_type.type_params)
+    if is_nullable:
+        ch_type = ch_type.type_params[0]
+
+    char_size = None
+    numeric_precision = None
+    numeric_scale = None
+    name = ch_type.name.lower()
+    if name == 'fixedstring' and ch_type.params:
+        char_size = _int_param(ch_type.params[0])
+    elif name == 'decimal':
+        numeric_precision = _int_param(ch_type.params[0]) if ch_type.params else 0
+        numeric_scale = _int_param(ch_type.params[1]) if len(ch_type.params) > 1 else 0
+    elif ch_type.name in _DECIMAL_PRECISION:
+        numeric_precision = _DECIMAL_PRECISION[ch_type.name]
+        numeric_scale = _int_param(ch_type.params[0]) if ch_type.params else 0
+    return _ColumnType(
+        str(ch_type),
+        is_nullable,
+        is_low_cardinality,
+        char_size,
+        numeric_precision,
+        numeric_scale,
+    )
+
+
+def _int_param(param: Any) -> Optional[int]:
+    try:
+        return int(param)
+    except (TypeError, ValueError):
+        return None
+
 
 @dataclass
 class ClickHouseColumn(Column):
@@ -18,36 +71,28 @@ class ClickHouseColumn(Column):
     }
     is_nullable: bool = False
     is_low_cardinality: bool = False
-    _low_card_regex = re.compile(r'^LowCardinality\((.*)\)$')
-    _nullable_regex = re.compile(r'^Nullable\((.*)\)$')
-    _fix_size_regex = re.compile(r'FixedString\((.*?)\)')
-    _decimal_regex = re.compile(r'Decimal\((\d+), (\d+)\)')
 
     def __init__(self, column: str, dtype: str) -> None:
-        char_size = None
-        numeric_precision = None
-        numeric_scale = None
-
-        dtype = self._inner_dtype(dtype)
-
-        if dtype.lower().startswith('fixedstring'):
-            match_sized = self._fix_size_regex.search(dtype)
-            if match_sized:
-                char_size = int(match_sized.group(1))
-
-        if dtype.lower().startswith('decimal'):
-            match_dec = self._decimal_regex.search(dtype)
-            numeric_precision = 0
-            numeric_scale = 0
-            if match_dec:
-                numeric_precision = int(match_dec.group(1))
-                numeric_scale = int(match_dec.group(2))
-
-        super().__init__(column, dtype, char_size, numeric_precision, numeric_scale)
+        # Parsing is cached by type string, so columns of the same type are constructed cheaply
+        column_type = _column_type(dtype)
+        self.is_nullable = column_type.is_nullable
+        self.is_low_cardinality = column_type.is_low_cardinality
+        super().__init__(
+            column,
+            column_type.dtype,
+            column_type.char_size,
+            column_type.numeric_precision,
+            column_type.numeric_scale,
+        )
 
     def __repr__(self) -> str:
         return f'<ClickhouseColumn {self.name} ({self.data_type}, is nullable: {self.is_nullable})>'
 
+    @property
+    def ch_type(self) -> ChType:
+        """The parsed ClickHouse type of the column, including any LowCardinality or Nullable"""
+        return parse_type(self.nested_type(self.dtype, self.is_low_cardinality, self.is_nullable))
+
     @property
     def data_type(self) -> str:
         if self.is_string():
@@ -122,19 +167,6 @@ class ClickHouseColumn(Column):
 
         return other_column.string_size() > self.string_size()
 
-    def _inner_dtype(self, dtype) -> str:
-        inner_dtype = dtype.strip()
-
-        if low_card_match := self._low_card_regex.search(inner_dtype):
-            self.is_low_cardinality = True
-            inner_dtype = low_card_match.group(1)
-
-        if null_match := self._nullable_regex.search(inner_dtype):
-            self.is_nullable = True
-            inner_dtype = null_match.group(1)
-
-        return inner_dtype
-
 
 @dataclass(frozen=True)
 class ClickHouseColumnChanges:
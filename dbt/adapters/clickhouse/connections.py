@@ -1,20 +1,51 @@
+import json
+import queue
 import re
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import dbt.exceptions
-from dbt.adapters.contracts.connection import AdapterResponse, Connection
+from dbt.adapters.contracts.connection import (
+    AdapterResponse,
+    Connection,
+    ConnectionState,
+    LazyHandle,
+)
 from dbt.adapters.sql import SQLConnectionManager
+from dbt_common.utils.encoding import ForgivingJSONEncoder
 
-from dbt.adapters.clickhouse.dbclient import ChRetryableException, get_db_client
+from dbt.adapters.clickhouse.dbclient import (
+    ChClientWrapper,
+    ChColumnarResult,
+    ChRetryableException,
+    get_db_client,
+)
 from dbt.adapters.clickhouse.logger import logger
+from dbt.adapters.clickhouse.pool import close_client_pools, get_client_pool
+from dbt.adapters.clickhouse.query import ddl_target_relations, is_database_ddl
 
 if TYPE_CHECKING:
     import agate
 
+    from dbt.adapters.clickhouse.cache import ClickHouseRelationsCache
+
 retryable_exceptions = [ChRetryableException]
 ddl_re = re.compile(r'^\s*(CREATE|DROP|ALTER)\s', re.IGNORECASE)
+wrapper_type_re = re.compile(r'^(?:Nullable|LowCardinality)\((.*)\)$')
+
+
+@dataclass
+class ClickHouseAdapterResponse(AdapterResponse):
+    read_rows: Optional[int] = None
+    read_bytes: Optional[int] = None
+    written_rows: Optional[int] = None
+    written_bytes: Optional[int] = None
+    elapsed: Optional[float] = None
+    memory_usage: Optional[int] = None
 
 
 class ClickHouseConnectionManager(SQLConnectionManager):
@@ -23,6 +54,8 @@ class ClickHouseConnectionManager(SQLConnectionManager):
     """
 
     TYPE = 'clickhouse'
+    # Set by the adapter, so that DDL statements can invalidate cached relation metadata
+    relations_cache: Optional["ClickHouseRelationsCache"] = None
 
     @contextmanager
     def exception_handler(self, sql):
@@ -42,6 +75,8 @@ class ClickHouseConnectionManager(SQLConnectionManager):
         credentials = cls.get_credentials(connection.credentials)
 
         def connect():
+            if credentials.pool_size > 0:
+                return get_client_pool(credentials).acquire()
             return get_db_client(credentials)
 
         return cls.retry_connection(
@@ -55,26 +90,90 @@ class ClickHouseConnectionManager(SQLConnectionManager):
     def cancel(self, connection):
         connection_name = connection.name
         logger.debug('Cancelling query \'{}\'', connection_name)
-        connection.handle.close()
+        client = connection.handle
+        query_id = client.running_query_id
+        if query_id:
+            # Closing the connection doesn't stop the query on the server, so kill it explicitly
+            # from a separate connection
+            credentials = self.get_credentials(connection.credentials)
+            pool = get_client_pool(credentials) if credentials.pool_size > 0 else None
+            try:
+                side_client = pool.acquire() if pool else get_db_client(credentials)
+                try:
+                    side_client.kill_query(
+                        query_id, credentials.cluster, credentials.kill_query_sync
+                    )
+                finally:
+                    if pool:
+                        pool.release(side_client)
+                    else:
+                        side_client.close()
+            except Exception as ex:
+                logger.debug(f'Failed to kill query {query_id}: {ex}')
+        client.close()
         logger.debug('Cancel query \'{}\'', connection_name)
 
+    def cancel_open(self) -> List[str]:
+        names = []
+        this_connection = self.get_if_exists()
+        with self.lock:
+            for connection in self.thread_connections.values():
+                if connection is this_connection:
+                    continue
+                # Check the state first, since reading the handle of a released connection would
+                # acquire a client only to cancel it
+                if connection.state == ConnectionState.OPEN and connection.handle is not None:
+                    self.cancel(connection)
+                if connection.name is not None:
+                    names.append(connection.name)
+        return names
+
     def release(self):
-        pass  # There is no "release" type functionality in the existing ClickHouse connectors
+        with self.lock:
+            conn = self.get_if_exists()
+            if conn is None or conn.state != ConnectionState.OPEN:
+                return
+            credentials = self.get_credentials(conn.credentials)
+            if credentials.pool_size <= 0:
+                return
+            # Return the client to the pool. The connection reopens lazily (usually with a
+            # pooled client) the next time its handle is used
+            client = conn.handle
+            conn.handle = LazyHandle(self.open)
+            conn.state = ConnectionState.INIT
+        get_client_pool(credentials).release(client)
+
+    def cleanup_all(self):
+        super().cleanup_all()
+        close_client_pools()
 
     @classmethod
-    def get_table_from_response(cls, response, column_names) -> "agate.Table":
+    def get_table_from_response(cls, result: ChColumnarResult) -> "agate.Table":
         """
-        Build agate table from response.
-        :param response: ClickHouse query result
-        :param column_names: Table column names
+        Build agate table directly from the columns of a ClickHouse query result.  Column types
+        are derived from the ClickHouse types, so agate type inference only runs for columns
+        with ClickHouse types that have no obvious agate equivalent.
+        :param result: Column oriented ClickHouse query result
         """
-        from dbt_common.clients.agate_helper import table_from_data_flat
+        import agate
+        from dbt_common.clients.agate_helper import build_type_tester
 
-        data = []
-        for row in response:
-            data.append(dict(zip(column_names, row)))
+        column_names = tuple(result.column_names)
+        column_types = []
+        columns = []
+        for name, ch_type, values in zip(column_names, result.column_types, result.columns):
+            agate_type, convert = _agate_column_type(ch_type)
+            if agate_type is None:
+                values = [_flatten_value(value) for value in values]
+                text_only = [name] if any(isinstance(value, str) for value in values) else []
+                type_tester = build_type_tester(text_only, string_null_values=())
+                agate_type = type_tester.run([(value,) for value in values], [name])[0]
+                convert = agate_type.cast
+            column_types.append(agate_type)
+            columns.append(values if convert is None else [convert(value) for value in values])
 
-        return table_from_data_flat(data, column_names)
+        rows = [agate.Row(values, column_names) for values in zip(*columns)]
+        return agate.Table(rows, column_names, column_types, _is_fork=True)
 
     def execute(
         self, sql: str, auto_begin: bool = False, fetch: bool = False, limit: Optional[int] = None
@@ -83,6 +182,8 @@ class ClickHouseConnectionManager(SQLConnectionManager):
         if fetch and ddl_re.match(sql):
             fetch = False
 
+        ddl_targets = ddl_target_relations(sql)
+        database_ddl = is_database_ddl(sql)
         sql = self._add_query_comment(sql)
         conn = self.get_thread_connection()
         client = conn.handle
@@ -90,21 +191,33 @@ class ClickHouseConnectionManager(SQLConnectionManager):
         with self.exception_handler(sql):
             logger.debug(f'On {conn.name}: {sql}...')
             pre = time.time()
+            try:
+                if fetch:
+                    # Only read as many result rows as requested.  Pushing the limit to the server
+                    # as max_result_rows is not safe, since that setting also applies to subqueries
+                    max_fetch_rows = self.get_credentials(conn.credentials).max_fetch_rows
+                    max_rows = limit if limit is not None else (max_fetch_rows or None)
+                    query_result = client.query_columns(sql, max_rows=max_rows)
+                    if query_result.truncated and limit is None:
+                        raise dbt.exceptions.DbtRuntimeError(
+                            f'Query returned more than the {max_fetch_rows} rows allowed by the '
+                            '`max_fetch_rows` setting'
+                        )
+                else:
+                    query_result = client.command(sql)
+            finally:
+                self._ddl_executed(ddl_targets, database_ddl)
+            response = self.get_response(client)
+            logger.debug(f'SQL status: {response} in {(time.time() - pre):.2f} seconds')
             if fetch:
-                query_result = client.query(sql)
-            else:
-                query_result = client.command(sql)
-            status = self.get_status(client)
-            logger.debug(f'SQL status: {status} in {(time.time() - pre):.2f} seconds')
-            if fetch:
-                table = self.get_table_from_response(
-                    query_result.result_set, query_result.column_names
-                )
+                table = self.get_table_from_response(query_result)
+                if not response.rows_affected:
+                    response.rows_affected = len(table.rows)
             else:
                 from dbt_common.clients.agate_helper import empty_table
 
                 table = empty_table()
-            return AdapterResponse(_message=status), table
+            return response, table
 
     def add_query(
         self,
@@ -113,16 +226,153 @@ class ClickHouseConnectionManager(SQLConnectionManager):
         bindings: Optional[Any] = None,
         abridge_sql_log: bool = False,
     ) -> Tuple[Connection, Any]:
+        ddl_targets = ddl_target_relations(sql)
+        database_ddl = is_database_ddl(sql)
         sql = self._add_query_comment(sql)
         conn = self.get_thread_connection()
         client = conn.handle
         with self.exception_handler(sql):
             logger.debug(f'On {conn.name}: {sql}...')
             pre = time.time()
-            client.command(sql)
-            status = self.get_status(client)
-            logger.debug(f'SQL status: {status} in {(time.time() - pre):0.2f} seconds')
-            return conn, None
+            try:
+                client.command(sql)
+            finally:
+                self._ddl_executed(ddl_targets, database_ddl)
+            response = self.get_response(client)
+            logger.debug(f'SQL status: {response} in {(time.time() - pre):0.2f} seconds')
+            # The client acts as the "cursor", so get_response works with the add_query result
+            return conn, client
+
+    def insert_columns(
+        self,
+        table: str,
+        column_names: Sequence[str],
+        column_types: Sequence[str],
+        columns: Sequence[Sequence[Any]],
+        settings: Optional[Dict[str, Any]] = None,
+        batch_rows: int = 0,
+        insert_threads: int = 1,
+        retries: int = 0,
+    ) -> AdapterResponse:
+        """
+        Insert column oriented Python values through the native insert API of the driver, instead
+        of serializing them into the SQL statement.
+
+        With `batch_rows` the values are inserted in chunks of at most that many rows, and the
+        chunks are spread over up to `insert_threads` (pooled) connections.  Each chunk has its
+        own insert_deduplication_token, so a chunk retried up to `retries` times after a failure
+        is only written once to tables that deduplicate inserts.
+        """
+        conn = self.get_thread_connection()
+        row_count = len(columns[0]) if columns else 0
+        if batch_rows <= 0 or batch_rows >= row_count:
+            batch_rows = max(row_count, 1)
+        chunks = [
+            [column[start : start + batch_rows] for column in columns]
+            for start in range(0, row_count, batch_rows)
+        ] or [list(columns)]
+        token = (settings or {}).get('insert_deduplication_token') or str(uuid.uuid4())
+        description = f'insert into {table} ({", ".join(column_names)}) values ({row_count} rows'
+        if len(chunks) > 1:
+            description += f' in {len(chunks)} chunks'
+        description += ')'
+
+        def insert_chunk(client, ix: int) -> ClickHouseAdapterResponse:
+            chunk_settings = settings
+            if len(chunks) > 1 or retries:
+                chunk_settings = {**(settings or {}), 'insert_deduplication_token': f'{token}-{ix}'}
+            attempt = 0
+            while True:
+                try:
+                    client.insert(table, column_names, column_types, chunks[ix], chunk_settings)
+                    return self.get_response(client)
+                except Exception as ex:
+                    if attempt >= retries:
+                        raise
+                    attempt += 1
+                    logger.warning(f'Retrying chunk {ix} of insert into {table} after error: {ex}')
+
+        with self.exception_handler(description):
+            logger.debug(f'On {conn.name}: {description}...')
+            pre = time.time()
+            insert_threads = min(insert_threads, len(chunks))
+            if insert_threads > 1:
+                credentials = self.get_credentials(conn.credentials)
+                responses = self._insert_parallel(
+                    credentials, insert_chunk, len(chunks), insert_threads
+                )
+            else:
+                responses = [insert_chunk(conn.handle, ix) for ix in range(len(chunks))]
+            response = _combine_responses(responses)
+            logger.debug(f'SQL status: {response} in {(time.time() - pre):0.2f} seconds')
+            return response
+
+    def insert_file(
+        self,
+        table: str,
+        column_names: Sequence[str],
+        path: str,
+        fmt: str,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> AdapterResponse:
+        """Stream a file in a ClickHouse input format from disk into a table"""
+        conn = self.get_thread_connection()
+        client = conn.handle
+        description = f'insert into {table} ({", ".join(column_names)}) format {fmt} from {path}'
+        with self.exception_handler(description):
+            logger.debug(f'On {conn.name}: {description}...')
+            pre = time.time()
+            client.insert_file(table, column_names, path, fmt, settings)
+            response = self.get_response(client)
+            logger.debug(f'SQL status: {response} in {(time.time() - pre):0.2f} seconds')
+            return response
+
+    @staticmethod
+    def _insert_parallel(
+        credentials, insert_chunk: Callable, chunk_count: int, insert_threads: int
+    ) -> List[ClickHouseAdapterResponse]:
+        """
+        Run insert_chunk for each chunk on `insert_threads` worker threads, each with its own client
+        from the connection pool (or a new client if pooling is disabled).  Clients are closed
+        instead of returned to the pool after an error.
+        """
+        pool = get_client_pool(credentials) if credentials.pool_size > 0 else None
+        clients: "queue.SimpleQueue[ChClientWrapper]" = queue.SimpleQueue()
+
+        def run(ix: int) -> ClickHouseAdapterResponse:
+            try:
+                client = clients.get_nowait()
+            except queue.Empty:
+                client = pool.acquire() if pool else get_db_client(credentials)
+            try:
+                response = insert_chunk(client, ix)
+            except Exception:
+                client.close()
+                raise
+            clients.put(client)
+            return response
+
+        try:
+            with ThreadPoolExecutor(insert_threads, thread_name_prefix='dbt-ch-insert') as executor:
+                return list(executor.map(run, range(chunk_count)))
+        finally:
+            while not clients.empty():
+                client = clients.get_nowait()
+                if pool:
+                    pool.release(client)
+                else:
+                    client.close()
+
+    def _ddl_executed(self, ddl_targets, database_ddl: bool = False) -> None:
+        # Even a failed DDL statement may have changed the relation (for example on some replicas)
+        if self.relations_cache is None:
+            return
+        if ddl_targets is not None:
+            self.relations_cache.invalidate_columns(ddl_targets or None)
+        if database_ddl:
+            # Databases created or dropped by SQL (such as the create_schema macro) instead of
+            # the adapter create_schema and drop_schema methods
+            self.relations_cache.invalidate_databases()
 
     @classmethod
     def get_credentials(cls, credentials):
@@ -139,8 +389,18 @@ class ClickHouseConnectionManager(SQLConnectionManager):
         return 'OK'
 
     @classmethod
-    def get_response(cls, _):
-        return 'OK'
+    def get_response(cls, client) -> ClickHouseAdapterResponse:
+        """
+        Returns the response for the last statement run by the client, including the server
+        statistics for the statement
+        """
+        stats = dict(client.last_query_stats)
+        result_rows = stats.pop('result_rows', None)
+        return ClickHouseAdapterResponse(
+            _message=cls.get_status(client),
+            rows_affected=stats.get('written_rows') or result_rows,
+            **stats,
+        )
 
     def begin(self):
         pass
@@ -152,3 +412,56 @@ class ClickHouseConnectionManager(SQLConnectionManager):
     def data_type_code_to_name(cls, type_code: Union[int, str]) -> str:
         assert isinstance(type_code, int)
         return ''
+
+
+def _combine_responses(responses: List[ClickHouseAdapterResponse]) -> ClickHouseAdapterResponse:
+    """Combine the responses of the chunks of a single insert"""
+    if len(responses) == 1:
+        return responses[0]
+    combined = ClickHouseAdapterResponse(_message=responses[0]._message, rows_affected=0)
+    for stat in ('rows_affected', 'written_rows', 'written_bytes', 'elapsed'):
+        values = [getattr(response, stat) for response in responses]
+        if any(value is not None for value in values):
+            setattr(combined, stat, sum(value or 0 for value in values))
+    memory_usage = [response.memory_usage or 0 for response in responses]
+    combined.memory_usage = max(memory_usage) or None
+    return combined
+
+
+def _agate_column_type(
+    ch_type: str,
+) -> Tuple[Optional["agate.data_types.DataType"], Optional[Callable]]:
+    """
+    Returns the agate type for a ClickHouse type, and the conversion (if any) required for the
+    values returned by the ClickHouse drivers.  Returns None for the agate type if it should
+    be inferred from the column values.
+    """
+    import agate
+    from dbt_common.clients.agate_helper import Integer, Number
+
+    while match := wrapper_type_re.match(ch_type):
+        ch_type = match.group(1)
+    if ch_type.startswith(('Int', 'UInt')):
+        return Integer(), None
+    if ch_type.startswith(('Float', 'Decimal')):
+        number = Number()
+        return number, number.cast
+    if ch_type == 'Bool':
+        return agate.Boolean(), None
+    if ch_type in ('Date', 'Date32'):
+        return agate.Date(), None
+    if ch_type.startswith('DateTime'):
+        return agate.DateTime(), None
+    if ch_type.startswith(('String', 'FixedString', 'Enum', 'UUID')):
+        text = agate.Text(null_values=())
+        return text, text.cast
+    if ch_type.startswith(('Array', 'Map', 'Tuple', 'Nested', 'JSON', 'Object')):
+        return agate.Text(null_values=()), _flatten_value
+    return None, None
+
+
+def _flatten_value(value: Any) -> Any:
+    # Represent container types as json strings, as dbt does when building tables from rows
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, cls=ForgivingJSONEncoder)
+    return value
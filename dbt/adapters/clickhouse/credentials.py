@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from dbt.adapters.contracts.connection import Credentials
-from dbt_common.exceptions import DbtRuntimeError
+from dbt_common.exceptions import DbtConfigError, DbtRuntimeError
 
 
 @dataclass
@@ -13,6 +13,9 @@ class ClickHouseCredentials(Credentials):
 
     driver: Optional[str] = None
     host: str = 'localhost'
+    hosts: Optional[List[str]] = None
+    load_balancing: str = 'round_robin'
+    host_failure_cooldown: int = 30
     port: Optional[int] = None
     user: Optional[str] = 'default'
     retries: int = 1
@@ -38,6 +41,15 @@ class ClickHouseCredentials(Credentials):
     local_db_prefix: str = ''
     allow_automatic_deduplication: bool = False
     tcp_keepalive: Union[bool, tuple[int, int, int], list[int]] = False
+    capability_cache_path: Optional[str] = None
+    capability_cache_ttl: int = 86400
+    pool_size: int = 8
+    pool_idle_timeout: int = 300
+    max_fetch_rows: int = 0
+    kill_query_sync: bool = False
+    http_session: bool = True
+    persist_relation_cache: bool = False
+    prefetch_columns: bool = False
 
     @property
     def type(self):
@@ -58,6 +70,15 @@ class ClickHouseCredentials(Credentials):
             )
         self.database = ''
 
+        # Tables created by a model on one host must exist on the host that runs the models and
+        # tests depending on it, which requires DDL to be replicated to every host
+        replicated_ddl = self.cluster or (self.database_engine or '').startswith('Replicated')
+        if self.hosts and len(self.hosts) > 1 and not replicated_ddl:
+            raise DbtConfigError(
+                'Connections can only be spread across multiple hosts if DDL is replicated to '
+                'all of them, with a cluster or a Replicated database_engine'
+            )
+
         # clickhouse_driver expects tcp_keepalive to be a tuple if it's not a boolean
         if isinstance(self.tcp_keepalive, list):
             self.tcp_keepalive = tuple(self.tcp_keepalive)
@@ -66,6 +87,9 @@ class ClickHouseCredentials(Credentials):
         return (
             'driver',
             'host',
+            'hosts',
+            'load_balancing',
+            'host_failure_cooldown',
             'port',
             'user',
             'schema',
@@ -87,4 +111,13 @@ class ClickHouseCredentials(Credentials):
             'use_lw_deletes',
             'allow_automatic_deduplication',
             'tcp_keepalive',
+            'capability_cache_path',
+            'capability_cache_ttl',
+            'pool_size',
+            'pool_idle_timeout',
+            'max_fetch_rows',
+            'kill_query_sync',
+            'http_session',
+            'persist_relation_cache',
+            'prefetch_columns',
         )
@@ -0,0 +1,124 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+# Types whose parameters are all types
+_TYPE_PARAMS = {'Nullable', 'LowCardinality', 'Array', 'Map', 'Tuple', 'Nested', 'Variant'}
+# Types with an aggregate function followed by type parameters
+_AGGREGATE_PARAMS = {'AggregateFunction', 'SimpleAggregateFunction'}
+# Types with named elements, such as Tuple(a String, b UInt8)
+_NAMED_PARAMS = {'Tuple', 'Nested'}
+
+_type_re = re.compile(r'^\s*([A-Za-z_]\w*(?:\s+[A-Za-z_]\w*)*)\s*(?:\((.*)\))?\s*$', re.DOTALL)
+_element_re = re.compile(
+    r'^\s*(`(?:[^`\\]|\\.)*`|"(?:[^"\\]|\\.)*"|[A-Za-z_][\w.]*)\s+(\S.*)$', re.DOTALL
+)
+
+
+@dataclass(frozen=True)
+class ChType:
+    """
+    A parsed ClickHouse data type.  Type parameters of composite types (such as the element
+    types of an Array or Tuple) are parsed ChTypes, while other parameters (such as the scale
+    of a Decimal or the values of an Enum) are kept as their literal text.  Elements of Tuple
+    and Nested types may have a field name.
+    """
+
+    name: str
+    params: Tuple[Union['ChType', str], ...] = ()
+    field_name: Optional[str] = None
+
+    def __str__(self) -> str:
+        text = self.name
+        if self.params:
+            text = f"{text}({', '.join(str(param) for param in self.params)})"
+        if self.field_name:
+            text = f'{self.field_name} {text}'
+        return text
+
+    @property
+    def nullable(self) -> bool:
+        return self.name == 'Nullable'
+
+    @property
+    def low_cardinality(self) -> bool:
+        return self.name == 'LowCardinality'
+
+    @property
+    def type_params(self) -> Tuple['ChType', ...]:
+        return tuple(param for param in self.params if isinstance(param, ChType))
+
+    def unwrapped(self) -> 'ChType':
+        """The type without any LowCardinality or Nullable wrappers"""
+        ch_type = self
+        while (ch_type.low_cardinality or ch_type.nullable) and ch_type.type_params:
+            ch_type = ch_type.type_params[0]
+        return ch_type
+
+
+@lru_cache(maxsize=4096)
+def parse_type(type_str: str) -> ChType:
+    """
+    Parse a ClickHouse data type such as `LowCardinality(Nullable(String))` or
+    `Map(String, Array(Tuple(a UInt8, b Decimal(10, 2))))`.  Types that can't be parsed are
+    returned as a ChType named with the stripped type string.
+    """
+    match = _type_re.match(type_str)
+    if not match:
+        return ChType(type_str.strip())
+    name, params_str = match.group(1), match.group(2)
+    if params_str is None or not params_str.strip():
+        return ChType(name)
+    params = _split_params(params_str)
+    if params is None:
+        return ChType(type_str.strip())
+    if name in _TYPE_PARAMS:
+        return ChType(name, tuple(_parse_param(param, name in _NAMED_PARAMS) for param in params))
+    if name in _AGGREGATE_PARAMS:
+        return ChType(
+            name,
+            (params[0], *(_parse_param(param, False) for param in params[1:])),
+        )
+    return ChType(name, tuple(params))
+
+
+def _parse_param(param: str, named: bool) -> ChType:
+    if named:
+        match = _element_re.match(param)
+        if match and not match.group(2).startswith('('):
+            element = parse_type(match.group(2))
+            return ChType(element.name, element.params, match.group(1))
+    return parse_type(param)
+
+
+def _split_params(params_str: str) -> Optional[List[str]]:
+    """Split type parameters on top level commas, or return None if they are unbalanced"""
+    params = []
+    depth = 0
+    quote = ''
+    start = 0
+    ix = 0
+    while ix < len(params_str):
+        char = params_str[ix]
+        if quote:
+            if char == '\\':
+                ix += 1
+            elif char == quote:
+                quote = ''
+        elif char in ('\'', '"', '`'):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < 0:
+                return None
+        elif char == ',' and depth == 0:
+            params.append(params_str[start:ix].strip())
+            start = ix + 1
+        ix += 1
+    if depth or quote:
+        return None
+    params.append(params_str[start:].strip())
+    return params
@@ -1,11 +1,15 @@
 import copy
+import datetime
 import uuid
 from abc import ABC, abstractmethod
-from typing import Dict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
 from dbt.adapters.exceptions import FailedToConnectError
 from dbt_common.exceptions import DbtConfigError, DbtDatabaseError
 
+from dbt.adapters.clickhouse.capabilities import ServerCapabilities, capability_registry
 from dbt.adapters.clickhouse.credentials import ClickHouseCredentials
 from dbt.adapters.clickhouse.errors import (
     lw_deletes_not_enabled_error,
@@ -14,12 +18,25 @@ from dbt.adapters.clickhouse.errors import (
     nd_mutations_not_enabled_warning,
 )
 from dbt.adapters.clickhouse.logger import logger
-from dbt.adapters.clickhouse.query import quote_identifier
-from dbt.adapters.clickhouse.util import compare_versions
+from dbt.adapters.clickhouse.query import escape_str, quote_identifier
+from dbt.adapters.clickhouse.settings import (
+    LW_DELETE_SETTING,
+    ND_MUTATION_SETTING,
+    ChSetting,
+    ServerSettings,
+)
+from dbt.adapters.clickhouse.util import compare_versions, get_timezone
 
-LW_DELETE_SETTING = 'allow_experimental_lightweight_delete'
-ND_MUTATION_SETTING = 'allow_nondeterministic_mutations'
 DEDUP_WINDOW_SETTING = 'replicated_deduplication_window'
+# Integer statistics reported in the HTTP X-ClickHouse-Summary header and native progress packets
+QUERY_STAT_KEYS = (
+    'read_rows',
+    'read_bytes',
+    'written_rows',
+    'written_bytes',
+    'result_rows',
+    'memory_usage',
+)
 DEDUP_WINDOW_SETTING_SUPPORTED_MATERIALIZATION = [
     "table",
     "incremental",
@@ -47,7 +64,13 @@ def get_db_client(credentials: ClickHouseCredentials):
 
     credentials.driver = driver
     credentials.port = port
-    if driver == 'native':
+    if credentials.hosts:
+        return _connect_any_host(credentials)
+    return _create_db_client(credentials)
+
+
+def _create_db_client(credentials: ClickHouseCredentials):
+    if credentials.driver == 'native':
         try:
             import clickhouse_driver  # noqa
 
@@ -70,30 +93,97 @@ def get_db_client(credentials: ClickHouseCredentials):
         ) from ex
 
 
+def _connect_any_host(credentials: ClickHouseCredentials):
+    """
+    Connect to the first available host of the credentials hosts list, in the order chosen by
+    the load balancing policy.  Hosts that fail with a retryable error are skipped.
+    """
+    from dbt.adapters.clickhouse.hosts import get_host_selector
+
+    selector = get_host_selector(credentials, credentials.port)
+    last_ex: Optional[Exception] = None
+    for host, port in selector.candidates():
+        host_credentials = replace(credentials, host=host, port=port, hosts=None)
+        try:
+            client = _create_db_client(host_credentials)
+        except ChRetryableException as ex:
+            logger.warning(f'Unable to connect to ClickHouse host {host}:{port}: {ex}')
+            selector.failed((host, port))
+            last_ex = ex
+            continue
+        selector.connected((host, port))
+        client.on_close = lambda host_port=(host, port): selector.disconnected(host_port)
+        return client
+    raise ChRetryableException(f'Unable to connect to any ClickHouse host: {last_ex}') from last_ex
+
+
 class ChRetryableException(Exception):
     pass
 
 
+@dataclass
+class ChColumnarResult:
+    """
+    Column oriented query result, with ClickHouse type names for each column
+    """
+
+    column_names: List[str]
+    column_types: List[str]
+    columns: List[Sequence[Any]]
+    # True if the query returned more rows than were read
+    truncated: bool = False
+
+
 class ChClientWrapper(ABC):
     def __init__(self, credentials: ClickHouseCredentials):
         self.database = credentials.schema
+        # Called once when the client is closed
+        self.on_close: Optional[Callable[[], None]] = None
+        self.last_query_stats: Dict[str, Any] = {}
+        # The query_id of the statement currently running on this client, used for cancellation
+        self.running_query_id: Optional[str] = None
+        self._server_tz: Optional[datetime.tzinfo] = None
+        self.server_settings = ServerSettings(self._load_settings)
         custom_settings = credentials.custom_settings or {}
         self._conn_settings = custom_settings.copy()
-        self._conn_settings['session_id'] = f'dbt::{uuid.uuid4()}'
+        self.use_session = self._uses_session(credentials)
+        if self.use_session:
+            self._conn_settings['session_id'] = f'dbt::{uuid.uuid4()}'
         if credentials.cluster_mode or credentials.database_engine == 'Replicated':
             self._conn_settings['database_replicated_enforce_synchronous_settings'] = '1'
             self._conn_settings['insert_quorum'] = 'auto'
         self._conn_settings['mutations_sync'] = '2'
         self._conn_settings['insert_distributed_sync'] = '1'
         self._client = self._create_client(credentials)
+        self._server_key = f'{credentials.host}|{credentials.port}|{credentials.user}'
         check_exchange = credentials.check_exchange and not credentials.cluster_mode
         try:
-            self._ensure_database(credentials.database_engine, credentials.cluster)
             self.server_version = self._server_version()
-            self.has_lw_deletes, self.use_lw_deletes = self._check_lightweight_deletes(
-                credentials.use_lw_deletes
+            self._ensure_database(credentials.database_engine, credentials.cluster)
+            capability_key = '|'.join(
+                str(part)
+                for part in (
+                    self._server_key,
+                    self.database,
+                    self.server_version,
+                    credentials.use_lw_deletes,
+                    check_exchange,
+                )
+            )
+            capabilities = capability_registry.get_or_probe(
+                capability_key,
+                lambda: self._probe_capabilities(credentials.use_lw_deletes, check_exchange),
+                credentials.capability_cache_path,
+                credentials.capability_cache_ttl,
             )
-            self.atomic_exchange = not check_exchange or self._check_atomic_exchange()
+            for setting_name, value in capabilities.conn_settings.items():
+                if self._conn_settings.get(setting_name) != value:
+                    self._set_client_setting(setting_name, value)
+                    self._conn_settings[setting_name] = value
+                    self.server_settings.update(setting_name, value)
+            self.has_lw_deletes = capabilities.has_lw_deletes
+            self.use_lw_deletes = capabilities.use_lw_deletes
+            self.atomic_exchange = capabilities.atomic_exchange
         except Exception as ex:
             self.close()
             raise ex
@@ -110,7 +200,7 @@ class ChClientWrapper(ABC):
         }
         if (
             not credentials.allow_automatic_deduplication
-            and compare_versions(self._server_version(), '22.7.1.2484') >= 0
+            and compare_versions(self.server_version, '22.7.1.2484') >= 0
         ):
             for materialization in DEDUP_WINDOW_SETTING_SUPPORTED_MATERIALIZATION:
                 self._model_settings[materialization][DEDUP_WINDOW_SETTING] = '0'
@@ -119,6 +209,14 @@ class ChClientWrapper(ABC):
     def query(self, sql: str, **kwargs):
         pass
 
+    @abstractmethod
+    def query_columns(self, sql: str, max_rows: Optional[int] = None, **kwargs) -> ChColumnarResult:
+        """
+        Stream the query result block by block into columns.  If max_rows is set, the stream is
+        abandoned (and the query cancelled) once max_rows rows have been read.
+        """
+        pass
+
     @abstractmethod
     def command(self, sql: str, **kwargs):
         pass
@@ -128,16 +226,69 @@ class ChClientWrapper(ABC):
         pass
 
     @abstractmethod
-    def get_ch_setting(self, setting_name):
+    def insert(
+        self,
+        table: str,
+        column_names: Sequence[str],
+        column_types: Sequence[str],
+        columns: Sequence[Sequence[Any]],
+        settings: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Insert column oriented Python values into a table using the native insert API of the
+        driver, where column_types are the ClickHouse types of the table columns
+        """
         pass
 
-    def database_dropped(self, database: str):
+    @abstractmethod
+    def insert_file(
+        self,
+        table: str,
+        column_names: Sequence[str],
+        path: str,
+        fmt: str,
+        settings: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Insert the contents of a file in a ClickHouse input format (such as CSVWithNames) into a
+        table, streaming the file in blocks so that it is never completely read into memory
+        """
         pass
 
+    def server_timezone(self) -> datetime.tzinfo:
+        if self._server_tz is None:
+            self._server_tz = get_timezone(str(self.command('SELECT timezone()')))
+        return self._server_tz
+
+    def get_ch_setting(self, setting_name):
+        setting = self.server_settings.get(setting_name)
+        return (setting.value, setting.readonly) if setting else (None, 0)
+
     @abstractmethod
-    def close(self):
+    def ping(self) -> bool:
         pass
 
+    def database_dropped(self, database: str):
+        capability_registry.database_dropped(database)
+
+    def close(self):
+        """Subclasses should call this after closing the underlying ClickHouse client"""
+        on_close, self.on_close = self.on_close, None
+        if on_close:
+            on_close()
+
+    def _uses_session(self, credentials: ClickHouseCredentials) -> bool:
+        """Whether statements on this client run in a single server session"""
+        return True
+
+    def _start_session(self) -> None:
+        """Run this and all later statements on the client in a new server session"""
+        session_id = f'dbt::{uuid.uuid4()}'
+        logger.debug(f'Statement requires a ClickHouse session, using session {session_id}')
+        self._set_client_setting('session_id', session_id)
+        self._conn_settings['session_id'] = session_id
+        self.use_session = True
+
     @abstractmethod
     def _create_client(self, credentials: ClickHouseCredentials):
         pass
@@ -150,6 +301,49 @@ class ChClientWrapper(ABC):
     def _server_version(self):
         pass
 
+    @abstractmethod
+    def _set_client_setting(self, setting_name: str, value: str):
+        pass
+
+    @abstractmethod
+    def _load_settings(self, setting_names: Iterable[str]) -> Dict[str, ChSetting]:
+        pass
+
+    def kill_query(self, query_id: str, cluster: Optional[str] = None, sync: bool = False):
+        """
+        Kill a query running on another client.  Unless sync is True this returns as soon as
+        the server has been asked to cancel the query.
+        """
+        cluster_clause = (
+            f' ON CLUSTER "{cluster}"' if cluster is not None and cluster.strip() != '' else ''
+        )
+        self.command(
+            f"KILL QUERY{cluster_clause} WHERE query_id = '{escape_str(query_id)}' "
+            f"{'SYNC' if sync else 'ASYNC'}"
+        )
+
+    @contextmanager
+    def _running_query(self):
+        """Tag a statement with a generated query_id so it can be killed from another client"""
+        self.running_query_id = str(uuid.uuid4())
+        try:
+            yield self.running_query_id
+        finally:
+            self.running_query_id = None
+
+    def _record_query_stats(
+        self, query_id: Optional[str], summary: Dict[str, Any], elapsed: Optional[float] = None
+    ):
+        stats: Dict[str, Any] = {'query_id': query_id or summary.get('query_id') or None}
+        for key in QUERY_STAT_KEYS:
+            value = summary.get(key)
+            if value is not None and value != '':
+                stats[key] = int(value)
+        if elapsed is None and summary.get('elapsed_ns'):
+            elapsed = int(summary['elapsed_ns']) / 1e9
+        stats['elapsed'] = elapsed
+        self.last_query_stats = stats
+
     def update_model_settings(self, model_settings: Dict[str, str], materialization_type: str):
         settings = self._model_settings.get(materialization_type, {})
         model_settings_to_add = copy.deepcopy(settings)
@@ -158,38 +352,51 @@ class ChClientWrapper(ABC):
             if key not in model_settings:
                 model_settings[key] = value
 
+    def _probe_capabilities(self, use_lw_deletes: bool, check_exchange: bool) -> ServerCapabilities:
+        has_lw_deletes, use_lw_deletes = self._check_lightweight_deletes(use_lw_deletes)
+        atomic_exchange = not check_exchange or self._check_atomic_exchange()
+        conn_settings = {
+            setting_name: self._conn_settings[setting_name]
+            for setting_name in (LW_DELETE_SETTING, ND_MUTATION_SETTING)
+            if setting_name in self._conn_settings
+        }
+        return ServerCapabilities(
+            server_version=self.server_version,
+            has_lw_deletes=has_lw_deletes,
+            use_lw_deletes=use_lw_deletes,
+            atomic_exchange=atomic_exchange,
+            conn_settings=conn_settings,
+        )
+
     def _check_lightweight_deletes(self, requested: bool):
-        lw_deletes, lw_read_only = self.get_ch_setting(LW_DELETE_SETTING)
-        nd_mutations, nd_mutations_read_only = self.get_ch_setting(ND_MUTATION_SETTING)
-        if lw_deletes is None or nd_mutations is None:
+        settings = self.server_settings
+        if settings.get(LW_DELETE_SETTING) is None or settings.get(ND_MUTATION_SETTING) is None:
             if requested:
                 logger.warning(lw_deletes_not_enabled_error)
             return False, False
-        lw_deletes = int(lw_deletes) > 0
+        lw_deletes = settings.get_int(LW_DELETE_SETTING, 0) > 0
         if not lw_deletes:
-            if lw_read_only:
+            if settings.is_readonly(LW_DELETE_SETTING):
                 lw_deletes = False
                 if requested:
                     raise DbtConfigError(lw_deletes_not_enabled_error)
                 logger.warning(lw_deletes_not_enabled_warning)
             else:
                 try:
-                    self.command(f'SET {LW_DELETE_SETTING} = 1')
-                    self._conn_settings[LW_DELETE_SETTING] = '1'
+                    self._enable_setting(LW_DELETE_SETTING)
                     lw_deletes = True
                 except DbtDatabaseError:
                     logger.warning(lw_deletes_not_enabled_warning)
-        nd_mutations = int(nd_mutations) > 0
+        nd_mutations = settings.get_int(ND_MUTATION_SETTING, 0) > 0
         if lw_deletes and not nd_mutations:
-            if nd_mutations_read_only:
+            if settings.is_readonly(ND_MUTATION_SETTING):
                 nd_mutations = False
                 if requested:
                     raise DbtConfigError(nd_mutations_not_enabled_error)
                 logger.warning(nd_mutations_not_enabled_warning)
             else:
                 try:
-                    self.command(f'SET {ND_MUTATION_SETTING} = 1')
-                    self._conn_settings[ND_MUTATION_SETTING] = '1'
+                    self._enable_setting(ND_MUTATION_SETTING)
                     nd_mutations = True
                 except DbtDatabaseError:
                     logger.warning(nd_mutations_not_enabled_warning)
@@ -197,9 +404,23 @@ class ChClientWrapper(ABC):
             return True, requested
         return False, False
 
+    def _enable_setting(self, setting_name: str) -> None:
+        if self.use_session:
+            self.command(f'SET {setting_name} = 1')
+        else:
+            # Without a session the setting must be sent with every request.  Run a trivial
+            # query with the setting first, so that an error is raised if the user can't change it
+            self.command('SELECT 1', settings={setting_name: '1'})
+            self._set_client_setting(setting_name, '1')
+        self._conn_settings[setting_name] = '1'
+        self.server_settings.update(setting_name, '1')
+
     def _ensure_database(self, database_engine, cluster_name) -> None:
         if not self.database:
             return
+        if capability_registry.database_ensured(self._server_key, self.database):
+            self._set_client_database()
+            return
         check_db = f'EXISTS DATABASE {quote_identifier(self.database)}'
         try:
             db_exists = self.command(check_db)
@@ -222,6 +443,7 @@ class ChClientWrapper(ABC):
             raise FailedToConnectError(
                 f'Failed to create {self.database} database due to ClickHouse exception'
             ) from ex
+        capability_registry.add_database(self._server_key, self.database)
         self._set_client_database()
 
     def _check_atomic_exchange(self) -> bool:
@@ -0,0 +1,110 @@
+import random
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from dbt_common.exceptions import DbtConfigError
+
+from dbt.adapters.clickhouse.credentials import ClickHouseCredentials
+
+HostPort = Tuple[str, int]
+
+ROUND_ROBIN = 'round_robin'
+LEAST_CONNECTIONS = 'least_connections'
+RANDOM = 'random'
+LOAD_BALANCING_POLICIES = (ROUND_ROBIN, LEAST_CONNECTIONS, RANDOM)
+
+
+def parse_host(entry: str, default_port: int) -> HostPort:
+    """Parse a `host`, `host:port`, or `[ipv6]:port` entry from the hosts list"""
+    entry = entry.strip()
+    if entry.startswith('['):
+        host, _, rest = entry[1:].partition(']')
+        port = rest[1:] if rest.startswith(':') else ''
+    elif entry.count(':') == 1:
+        host, port = entry.split(':')
+    else:
+        host, port = entry, ''
+    if not host or (port and not port.isdigit()):
+        raise DbtConfigError(f'Invalid ClickHouse host entry {entry}')
+    return host, int(port) if port else default_port
+
+
+class HostSelector:
+    """
+    Assigns new connections to one of several equivalent ClickHouse servers (typically the
+    replicas of a cluster).
+
+    Hosts that fail to connect are considered unhealthy and are only tried, after all healthy
+    hosts, until `cooldown` seconds have passed.  A successful connection marks the host as
+    healthy again.  Connection counts used by the least connections policy are maintained with
+    `connected` and `disconnected`.
+    """
+
+    def __init__(self, hosts: Sequence[HostPort], policy: str = ROUND_ROBIN, cooldown: int = 30):
+        if not hosts:
+            raise DbtConfigError('At least one ClickHouse host is required')
+        if policy not in LOAD_BALANCING_POLICIES:
+            raise DbtConfigError(
+                f'Invalid load_balancing policy {policy}, expected one of '
+                f'{", ".join(LOAD_BALANCING_POLICIES)}'
+            )
+        self.hosts = list(hosts)
+        self.policy = policy
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+        self._next = 0
+        self._connections: Dict[HostPort, int] = {host: 0 for host in self.hosts}
+        self._failed: Dict[HostPort, float] = {}
+
+    def candidates(self) -> List[HostPort]:
+        """All hosts, in the order connections should be attempted"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.hosts)
+            ordered = self.hosts[start:] + self.hosts[:start]
+            if self.policy == RANDOM:
+                random.shuffle(ordered)
+            elif self.policy == LEAST_CONNECTIONS:
+                # sort is stable, so hosts with equal counts stay in round robin order
+                ordered.sort(key=lambda host: self._connections[host])
+            now = time.monotonic()
+            healthy = [host for host in ordered if self._failed.get(host, 0) <= now]
+            unhealthy = [host for host in ordered if self._failed.get(host, 0) > now]
+        return healthy + unhealthy
+
+    def connected(self, host: HostPort) -> None:
+        with self._lock:
+            self._connections[host] += 1
+            self._failed.pop(host, None)
+
+    def disconnected(self, host: HostPort) -> None:
+        with self._lock:
+            self._connections[host] = max(0, self._connections[host] - 1)
+
+    def failed(self, host: HostPort) -> None:
+        with self._lock:
+            self._failed[host] = time.monotonic() + self._cooldown
+
+    def connection_count(self, host: HostPort) -> int:
+        with self._lock:
+            return self._connections[host]
+
+
+# Keyed by credentials identity for the same reason as the client pools.  The credentials are
+# retained so that the id can't be reused
+_selectors: Dict[int, Tuple[ClickHouseCredentials, HostSelector]] = {}
+_selectors_lock = threading.Lock()
+
+
+def get_host_selector(credentials: ClickHouseCredentials, default_port: int) -> HostSelector:
+    key = id(credentials)
+    with _selectors_lock:
+        entry = _selectors.get(key)
+        if entry is None:
+            hosts = [parse_host(host, default_port) for host in credentials.hosts or []]
+            selector = HostSelector(
+                hosts, credentials.load_balancing, credentials.host_failure_cooldown
+            )
+            entry = _selectors[key] = (credentials, selector)
+        return entry[1]
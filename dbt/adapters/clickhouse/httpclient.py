@@ -1,59 +1,165 @@
+import inspect
+import re
 from typing import List
 
 import clickhouse_connect
 from clickhouse_connect.driver.exceptions import DatabaseError, OperationalError
+from clickhouse_connect.driver.httpclient import HttpClient
+from clickhouse_connect.driver.summary import QuerySummary
 from dbt.adapters.__about__ import version as dbt_adapters_version
-from dbt_common.exceptions import DbtDatabaseError
+from dbt_common.exceptions import DbtConfigError, DbtDatabaseError
 
 from dbt.adapters.clickhouse import ClickHouseColumn
 from dbt.adapters.clickhouse.__version__ import version as dbt_clickhouse_version
-from dbt.adapters.clickhouse.dbclient import ChClientWrapper, ChRetryableException
+from dbt.adapters.clickhouse.dbclient import ChClientWrapper, ChColumnarResult, ChRetryableException
+from dbt.adapters.clickhouse.seed import file_blocks
+from dbt.adapters.clickhouse.settings import ChSetting
 from dbt.adapters.clickhouse.util import hide_stack_trace
 
+# Statements that only work in a ClickHouse session, such as creating a temporary table (which is
+# dropped at the end of the session) or SET (which only applies to the session)
+_session_re = re.compile(
+    r'^(?:\s|/\*.*?\*/|--[^\n]*\n)*(?:create\s+(?:or\s+replace\s+)?temporary\s+table|set)\s',
+    re.IGNORECASE | re.DOTALL,
+)
+
 
 class ChHttpClient(ChClientWrapper):
     def query(self, sql, **kwargs):
-        try:
-            return self._client.query(sql, **kwargs)
-        except DatabaseError as ex:
-            err_msg = hide_stack_trace(ex)
-            raise DbtDatabaseError(err_msg) from ex
+        self._check_session(sql)
+        with self._running_query() as query_id:
+            try:
+                result = self._client.query(sql, **_with_query_id(kwargs, query_id))
+            except DatabaseError as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_query_stats(result.query_id, result.summary)
+        return result
+
+    def query_columns(self, sql, max_rows=None, **kwargs):
+        self._check_session(sql)
+        truncated = False
+        row_count = 0
+        with self._running_query() as query_id:
+            try:
+                with self._client.query_column_block_stream(
+                    sql, **_with_query_id(kwargs, query_id)
+                ) as stream:
+                    column_names = list(stream.source.column_names)
+                    column_types = [ch_type.name for ch_type in stream.source.column_types]
+                    columns = [[] for _ in column_names]
+                    for block in stream:
+                        block_rows = len(block[0]) if block else 0
+                        if max_rows is not None and row_count + block_rows > max_rows:
+                            block = [column[: max_rows - row_count] for column in block]
+                            truncated = True
+                        for column, block_column in zip(columns, block):
+                            column.extend(block_column)
+                        row_count += block_rows
+                        if truncated:
+                            break
+                    # The summary header is sent before the result is streamed, so for longer
+                    # queries the statistics may only reflect the work done up to that point
+                    self._record_query_stats(stream.source.query_id, stream.source.summary)
+            except DatabaseError as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+        return ChColumnarResult(column_names, column_types, columns, truncated)
 
     def command(self, sql, **kwargs):
-        try:
-            return self._client.command(sql, **kwargs)
-        except DatabaseError as ex:
-            err_msg = hide_stack_trace(ex)
-            raise DbtDatabaseError(err_msg) from ex
+        self._check_session(sql)
+        with self._running_query() as query_id:
+            try:
+                result = self._client.command(sql, **_with_query_id(kwargs, query_id))
+            except DatabaseError as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            if isinstance(result, QuerySummary):
+                self._record_query_stats(result.query_id(), result.summary)
+            else:
+                self._record_query_stats(query_id, {})
+        return result
 
     def columns_in_query(self, sql: str, **kwargs) -> List[ClickHouseColumn]:
-        try:
-            query_result = self._client.query(
-                f"SELECT * FROM ( \n" f"{sql} \n" f") LIMIT 0",
-                **kwargs,
-            )
-            return [
-                ClickHouseColumn.create(name, ch_type.name)
-                for name, ch_type in zip(query_result.column_names, query_result.column_types)
-            ]
-        except DatabaseError as ex:
-            err_msg = hide_stack_trace(ex)
-            raise DbtDatabaseError(err_msg) from ex
-
-    def get_ch_setting(self, setting_name):
-        setting = self._client.server_settings.get(setting_name)
-        return (setting.value, setting.readonly) if setting else (None, 0)
+        with self._running_query() as query_id:
+            try:
+                query_result = self._client.query(
+                    f"SELECT * FROM ( \n" f"{sql} \n" f") LIMIT 0",
+                    **_with_query_id(kwargs, query_id),
+                )
+                return [
+                    ClickHouseColumn.create(name, ch_type.name)
+                    for name, ch_type in zip(query_result.column_names, query_result.column_types)
+                ]
+            except DatabaseError as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+
+    def insert(self, table, column_names, column_types, columns, settings=None):
+        with self._running_query() as query_id:
+            try:
+                summary = self._client.insert(
+                    table,
+                    columns,
+                    column_names=list(column_names),
+                    column_type_names=list(column_types),
+                    column_oriented=True,
+                    **_with_query_id({'settings': settings}, query_id),
+                )
+            except DatabaseError as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_query_stats(summary.query_id(), summary.summary)
+
+    def insert_file(self, table, column_names, path, fmt, settings=None):
+        with self._running_query() as query_id:
+            try:
+                summary = self._client.raw_insert(
+                    table,
+                    list(column_names),
+                    file_blocks(path),
+                    fmt=fmt,
+                    **_with_query_id({'settings': settings}, query_id),
+                )
+            except DatabaseError as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_query_stats(summary.query_id(), summary.summary)
+
+    def ping(self):
+        return self._client.ping()
 
     def database_dropped(self, database: str):
         # This is necessary for the http client to avoid exceptions when ClickHouse doesn't recognize the database
         # query parameter
+        super().database_dropped(database)
         if self.database == database:
             self._client.database = None
 
     def close(self):
         self._client.close()
+        super().close()
+
+    def _uses_session(self, credentials):
+        return credentials.http_session
+
+    def _check_session(self, sql: str) -> None:
+        """
+        Switch a session-less client to a new session for the rest of its life before running a
+        statement that needs one, so that later statements see its temporary table or settings
+        """
+        if not self.use_session and _session_re.match(sql):
+            self._start_session()
 
     def _create_client(self, credentials):
+        kwargs = {}
+        if not self.use_session:
+            if 'autogenerate_session_id' not in inspect.signature(HttpClient.__init__).parameters:
+                raise DbtConfigError(
+                    'http_session: False requires clickhouse-connect 0.7.0 or later, upgrade it '
+                    'with `pip install -U clickhouse-connect`'
+                )
+            kwargs['autogenerate_session_id'] = False
         try:
             return clickhouse_connect.get_client(
                 host=credentials.host,
@@ -70,6 +176,7 @@ class ChHttpClient(ChClientWrapper):
                 client_cert_key=credentials.client_cert_key,
                 query_limit=0,
                 settings=self._conn_settings,
+                **kwargs,
             )
         except OperationalError as ex:
             raise ChRetryableException(str(ex)) from ex
@@ -79,3 +186,25 @@ class ChHttpClient(ChClientWrapper):
 
     def _server_version(self):
         return self._client.server_version
+
+    def _load_settings(self, setting_names):
+        # clickhouse-connect reads all server settings when the client is created, but those
+        # values don't include the settings sent by this client with every request
+        settings = {}
+        for setting_name in setting_names:
+            setting = self._client.server_settings.get(setting_name)
+            if setting is None:
+                continue
+            value = self._client.get_client_setting(setting_name)
+            settings[setting_name] = ChSetting(
+                setting.value if value is None else str(value), bool(setting.readonly)
+            )
+        return settings
+
+    def _set_client_setting(self, setting_name, value):
+        self._client.set_client_setting(setting_name, value)
+
+
+def _with_query_id(kwargs, query_id: str):
+    settings = kwargs.get('settings') or {}
+    return {**kwargs, 'settings': {**settings, 'query_id': query_id}}
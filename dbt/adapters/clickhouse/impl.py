@@ -1,5 +1,7 @@
 import csv
 import io
+import json
+import os
 from dataclasses import dataclass
 from multiprocessing.context import SpawnContext
 from typing import (
@@ -9,8 +11,10 @@ from typing import (
     Dict,
     FrozenSet,
     Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
     Union,
@@ -20,15 +24,21 @@ from dbt.adapters.base import AdapterConfig, available
 from dbt.adapters.base.impl import BaseAdapter, ConstraintSupport
 from dbt.adapters.base.relation import BaseRelation, InformationSchema
 from dbt.adapters.capability import Capability, CapabilityDict, CapabilitySupport, Support
+from dbt.adapters.contracts.connection import AdapterResponse
 from dbt.adapters.contracts.relation import Path, RelationConfig
 from dbt.adapters.events.types import ConstraintNotSupported
 from dbt.adapters.sql import SQLAdapter
 from dbt_common.contracts.constraints import ConstraintType, ModelLevelConstraint
 from dbt_common.events.functions import warn_or_error
-from dbt_common.exceptions import DbtInternalError, DbtRuntimeError, NotImplementedError
+from dbt_common.exceptions import (
+    DbtConfigError,
+    DbtInternalError,
+    DbtRuntimeError,
+    NotImplementedError,
+)
 from dbt_common.utils import filter_null_values
 
-from dbt.adapters.clickhouse.cache import ClickHouseRelationsCache
+from dbt.adapters.clickhouse.cache import ClickHouseRelationsCache, ReferenceKey
 from dbt.adapters.clickhouse.column import ClickHouseColumn, ClickHouseColumnChanges
 from dbt.adapters.clickhouse.connections import ClickHouseConnectionManager
 from dbt.adapters.clickhouse.errors import (
@@ -39,13 +49,33 @@ from dbt.adapters.clickhouse.errors import (
 from dbt.adapters.clickhouse.logger import logger
 from dbt.adapters.clickhouse.query import quote_identifier
 from dbt.adapters.clickhouse.relation import ClickHouseRelation, ClickHouseRelationType
+from dbt.adapters.clickhouse.relation_store import (
+    RELATION_STORE_FILE,
+    RelationStore,
+    SchemaSnapshot,
+)
+from dbt.adapters.clickhouse.seed import (
+    CSV_FORMAT,
+    DEFAULT_SEED_SAMPLE_ROWS,
+    arrow_file_columns,
+    comment_seed_hash,
+    compute_seed_hash,
+    format_seed_hash_comment,
+    sample_csv_table,
+    seed_columns,
+    seed_input_format,
+)
 from dbt.adapters.clickhouse.util import compare_versions
 
 if TYPE_CHECKING:
     import agate
 
 GET_CATALOG_MACRO_NAME = 'get_catalog'
-LIST_SCHEMAS_MACRO_NAME = 'list_schemas'
+
+# The type, can_exchange and can_on_cluster of a relation listed from system.tables
+RelationAttrs = Tuple[ClickHouseRelationType, bool, bool]
+# The schema, identifier, attributes and dependents of a listed relation
+ListedRelation = Tuple[str, str, RelationAttrs, List[List[str]]]
 
 IGNORED_SETTINGS = {
     'Memory': ['replicated_deduplication_window'],
@@ -87,6 +117,7 @@ class ClickHouseAdapter(SQLAdapter):
     def __init__(self, config, mp_context: SpawnContext):
         BaseAdapter.__init__(self, config, mp_context)
         self.cache = ClickHouseRelationsCache()
+        self.connections.relations_cache = self.cache
 
     @classmethod
     def date_function(cls):
@@ -160,6 +191,15 @@ class ClickHouseAdapter(SQLAdapter):
             return compare_versions(version, server_version) > 0
         return False
 
+    @available.parse_none
+    def get_server_setting(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        conn = self.connections.get_if_exists()
+        if conn:
+            value = conn.handle.get_ch_setting(name)[0]
+            if value is not None:
+                return value
+        return default
+
     @available.parse_none
     def supports_atomic_exchange(self) -> bool:
         conn = self.connections.get_if_exists()
@@ -239,7 +279,12 @@ class ClickHouseAdapter(SQLAdapter):
         changed_data_types = []
         for column in target_in_source:
             source_column = source_map.get(column.name)
-            if source_column is not None and column.dtype != source_column.dtype:
+            # Nullable and LowCardinality changes aren't schema changes, as before the types
+            # were parsed
+            if (
+                source_column is not None
+                and column.ch_type.unwrapped() != source_column.ch_type.unwrapped()
+            ):
                 changed_data_types.append(column)
 
         clickhouse_column_changes = ClickHouseColumnChanges(
@@ -309,11 +354,20 @@ class ClickHouseAdapter(SQLAdapter):
         return f"s3('{url}'{access}, '{fmt}'{struct}{comp}{extra_credentials})"
 
     def check_schema_exists(self, database, schema):
-        results = self.execute_macro(LIST_SCHEMAS_MACRO_NAME, kwargs={'database': database})
-        return schema in (row[0] for row in results)
+        return self._catalog_database(schema) is not None
+
+    def create_schema(self, relation: BaseRelation) -> None:
+        super().create_schema(relation)
+        if self.cache.get_databases() is not None:
+            database = self._get_database_without_caching(relation.schema)
+            if database:
+                self.cache.add_database(database)
+            else:
+                self.cache.invalidate_databases()
 
     def drop_schema(self, relation: BaseRelation) -> None:
         super().drop_schema(relation)
+        self.cache.remove_database(relation.schema)
         conn = self.connections.get_if_exists()
         if conn:
             conn.handle.database_dropped(relation.schema)
@@ -331,49 +385,259 @@ class ClickHouseAdapter(SQLAdapter):
     ) -> List[ClickHouseRelation]:
         kwargs = {'schema_relation': schema_relation}
         results = self.execute_macro('list_relations_without_caching', kwargs=kwargs)
-        conn_supports_exchange = self.supports_atomic_exchange()
+        return list(self._relations_from_rows(results))
 
-        relations = []
+    def _relations_cache_for_schemas(
+        self,
+        relation_configs: Iterable[RelationConfig],
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        """
+        Populate the relations cache for all required schemas with a single query, instead of
+        the default query per schema
+        """
+        schema_relations = cache_schemas or self._get_cache_schemas(relation_configs)
+        schemas = sorted({relation.schema for relation in schema_relations if relation.schema})
+        if schemas:
+            with self.connection_named('list_relations_in_schemas'):
+                store = self._relation_store()
+                if store:
+                    self._cache_from_relation_store(store, schemas)
+                else:
+                    results = self.execute_macro(
+                        'list_relations_in_schemas', kwargs={'schemas': schemas}
+                    )
+                    self._add_cache_links(self._cache_listed(self._listed_relations(results)))
+                conn = self.connections.get_if_exists()
+                if conn and conn.credentials.prefetch_columns:
+                    self._prefetch_columns(schemas)
+        # Also record the schemas without any relations, so they are known to be cached
+        self.cache.update_schemas(('', schema) for schema in schemas)
+
+    def _relation_store(self) -> Optional[RelationStore]:
+        conn = self.connections.get_if_exists()
+        if not conn or not conn.credentials.persist_relation_cache:
+            return None
+        credentials = conn.credentials
+        key = '|'.join(
+            str(part)
+            for part in (
+                credentials.host,
+                credentials.port,
+                credentials.user,
+                credentials.cluster,
+                self.supports_atomic_exchange(),
+            )
+        )
+        target_path = getattr(self.config, 'project_target_path', self.config.target_path)
+        return RelationStore(os.path.join(target_path, RELATION_STORE_FILE), key)
+
+    def _cache_from_relation_store(self, store: RelationStore, schemas: List[str]) -> None:
+        """
+        Add the relations of the persisted schema snapshots still matching the system.tables
+        signature of their database to the cache, and list the relations of the other schemas
+        """
+        results = self.execute_macro('get_schema_signatures', kwargs={'schemas': schemas})
+        signatures = {row[0]: f'{row[1]}|{row[2]}' for row in results}
+        snapshots = store.load()
+        stale = []
+        listed: List[ListedRelation] = []
+        for schema in schemas:
+            snapshot = snapshots.get(schema)
+            if snapshot is None or snapshot.signature != signatures.get(schema, ''):
+                stale.append(schema)
+                continue
+            for entry in snapshot.relations:
+                attrs = (
+                    ClickHouseRelationType(entry['type']),
+                    entry['can_exchange'],
+                    entry['can_on_cluster'],
+                )
+                listed.append((schema, entry['identifier'], attrs, entry.get('dependents', [])))
+        if stale:
+            logger.debug(f'Listing relations for changed databases {stale}')
+            for schema in stale:
+                snapshots[schema] = SchemaSnapshot(signatures.get(schema, ''))
+            results = self.execute_macro('list_relations_in_schemas', kwargs={'schemas': stale})
+            for schema, identifier, attrs, dependents in self._listed_relations(results):
+                listed.append((schema, identifier, attrs, dependents))
+                rel_type, can_exchange, can_on_cluster = attrs
+                snapshots[schema].relations.append(
+                    {
+                        'identifier': identifier,
+                        'type': str(rel_type),
+                        'can_exchange': can_exchange,
+                        'can_on_cluster': can_on_cluster,
+                        'dependents': dependents,
+                    }
+                )
+            store.save(snapshots)
+        self._add_cache_links(self._cache_listed(listed))
+
+    def _cache_listed(self, listed: Iterable[ListedRelation]) -> List[ListedRelation]:
+        """Add listed relations to the cache, to be built only once they are needed"""
+        added = []
+        for schema, identifier, attrs, dependents in listed:
+            self.cache.add_listed(schema, identifier, self._build_relation, attrs)
+            added.append((schema, identifier, attrs, dependents))
+        return added
+
+    def _add_cache_links(self, listed: List[ListedRelation]) -> None:
+        """Record the dependencies reported by system.tables (such as the materialized views
+        reading from a table) in the cache, once all of the listed relations have been added"""
+        for schema, identifier, _, dependents in listed:
+            for dependent_schema, dependent_identifier in dependents:
+                self.cache.add_link(
+                    ReferenceKey(schema, identifier),
+                    ReferenceKey(dependent_schema, dependent_identifier),
+                )
+
+    def _relations_from_rows(self, results: "agate.Table") -> Iterator[ClickHouseRelation]:
+        """Build relations from list_relations_in_schemas rows"""
+        for schema, identifier, attrs, _ in self._listed_relations(results):
+            yield self._build_relation(schema, identifier, attrs)
+
+    def _listed_relations(self, results: "agate.Table") -> Iterator[ListedRelation]:
+        """Parse list_relations_in_schemas rows, without building the relations"""
+        conn_supports_exchange = self.supports_atomic_exchange()
         for row in results:
-            name, schema, type_info, db_engine, on_cluster = row
+            name, schema, type_info, db_engine, on_cluster, dependents = row
             if 'view' in type_info:
                 rel_type = ClickHouseRelationType.View
             elif type_info == 'dictionary':
                 rel_type = ClickHouseRelationType.Dictionary
             else:
                 rel_type = ClickHouseRelationType.Table
-            can_exchange = (
+            can_exchange = bool(
                 conn_supports_exchange
                 and rel_type == ClickHouseRelationType.Table
                 and db_engine in ('Atomic', 'Replicated')
             )
             can_on_cluster = (on_cluster >= 1) and db_engine != 'Replicated'
+            # Array columns are returned as json strings in agate tables
+            if isinstance(dependents, str):
+                dependents = json.loads(dependents)
+            dependents = [list(dependent) for dependent in dependents or []]
+            yield schema, name, (rel_type, can_exchange, can_on_cluster), dependents
+
+    def _build_relation(
+        self, schema: Optional[str], identifier: Optional[str], attrs: RelationAttrs
+    ) -> ClickHouseRelation:
+        rel_type, can_exchange, can_on_cluster = attrs
+        return self.Relation.create(
+            database='',
+            schema=schema,
+            identifier=identifier,
+            type=rel_type,
+            can_exchange=can_exchange,
+            can_on_cluster=can_on_cluster,
+        )
 
-            relation = self.Relation.create(
-                database='',
-                schema=schema,
-                identifier=name,
-                type=rel_type,
-                can_exchange=can_exchange,
-                can_on_cluster=can_on_cluster,
+    def get_columns_in_relation(self, relation: BaseRelation) -> List[ClickHouseColumn]:
+        columns = self.cache.get_columns(relation)
+        if columns is None:
+            epoch = self.cache.columns_epoch
+            columns = super().get_columns_in_relation(relation)
+            self.cache.set_columns(relation, columns, epoch)
+        return columns
+
+    def _prefetch_columns(self, schemas: List[str]) -> None:
+        """Cache the columns of every relation in the schemas with a single query"""
+        epoch = self.cache.columns_epoch
+        results = self.execute_macro('get_columns_in_schemas', kwargs={'schemas': schemas})
+        relation_columns: Dict[Tuple[str, str], List[ClickHouseColumn]] = {}
+        for schema, table_name, column_name, column_type in results:
+            relation_columns.setdefault((schema, table_name), []).append(
+                self.Column(column_name, column_type)
             )
-            relations.append(relation)
+        for (schema, identifier), columns in relation_columns.items():
+            relation = self.Relation.create(database='', schema=schema, identifier=identifier)
+            self.cache.set_columns(relation, columns, epoch)
 
-        return relations
+    @available.parse_none
+    def get_dependent_relations(self, relation: BaseRelation) -> List[BaseRelation]:
+        """The cached relations (such as materialized views) that read from relation"""
+        return self.cache.get_dependents(relation)
+
+    @available.parse_none
+    def get_cached_views_like(self, relation: BaseRelation) -> Optional[List[str]]:
+        """
+        The names of the cached views in the schema of relation that contain the relation name,
+        or None if the relations of the schema aren't cached
+        """
+        if ('', relation.schema) not in self.cache:
+            return None
+        return [
+            cached.identifier
+            for cached in self.cache.get_relations(None, relation.schema)
+            if cached.type in (ClickHouseRelationType.View, ClickHouseRelationType.MaterializedView)
+            and relation.identifier in cached.identifier
+        ]
 
     def get_relation(self, database: Optional[str], schema: str, identifier: str):
-        return super().get_relation('', schema, identifier)
+        if not schema:
+            return super().get_relation('', schema, identifier)
+        if self._schema_is_cached('', schema):
+            # ClickHouse relations only match their exact identifier, so this is equivalent to
+            # searching the relations of the schema, but only builds the matching relation
+            return self.cache.get_cached_relation(schema, identifier)
+        return self._get_relation_without_caching(schema, identifier)
+
+    def _get_relation_without_caching(
+        self, schema: str, identifier: str
+    ) -> Optional[ClickHouseRelation]:
+        """
+        Look up a single relation in a schema that isn't cached (such as a source in a large
+        shared database) instead of listing the whole schema.  Found relations are added to the
+        cache, and missing relations are remembered for the rest of the run.
+        """
+        relation = self.cache.get_cached_relation(schema, identifier)
+        if relation is not None or self.cache.is_missing(schema, identifier):
+            return relation
+        epoch = self.cache.columns_epoch
+        results = self.execute_macro(
+            'list_relations_in_schemas', kwargs={'schemas': [schema], 'identifier': identifier}
+        )
+        relations = list(self._relations_from_rows(results))
+        if not relations:
+            self.cache.add_missing(schema, identifier, epoch)
+            return None
+        self.cache.add_looked_up(relations[0])
+        return relations[0]
 
     @available.parse_none
     def get_ch_database(self, schema: str):
         try:
-            results = self.execute_macro('clickhouse__get_database', kwargs={'database': schema})
-            if len(results.rows):
-                return ClickHouseDatabase(**results.rows[0])
-            return None
+            return self._catalog_database(schema)
         except DbtRuntimeError:
             return None
 
+    def _catalog_database(self, schema: str) -> Optional["ClickHouseDatabase"]:
+        database = self._database_catalog().get(schema)
+        if database is None:
+            # The database may have been created since the catalog was loaded by SQL that isn't
+            # recognized as database DDL, so a miss is checked before it's trusted
+            database = self._get_database_without_caching(schema)
+            if database:
+                self.cache.add_database(database)
+        return database
+
+    def _database_catalog(self) -> Dict[str, "ClickHouseDatabase"]:
+        """The ClickHouse databases by name, loaded with a single query on first use"""
+        databases = self.cache.get_databases()
+        if databases is None:
+            epoch = self.cache.databases_epoch
+            results = self.execute_macro('clickhouse__get_databases')
+            databases = {row['name']: ClickHouseDatabase(**row) for row in results.rows}
+            self.cache.set_databases(databases.values(), epoch)
+        return databases
+
+    def _get_database_without_caching(self, schema: str) -> Optional["ClickHouseDatabase"]:
+        results = self.execute_macro('clickhouse__get_database', kwargs={'database': schema})
+        if len(results.rows):
+            return ClickHouseDatabase(**results.rows[0])
+        return None
+
     def get_catalog(
         self,
         relation_configs: Iterable[RelationConfig],
@@ -454,6 +718,161 @@ class ClickHouseAdapter(SQLAdapter):
             clause += f' where {where_clause}'
         return clause
 
+    @available
+    def insert_seed_columns(
+        self, relation: ClickHouseRelation, agate_table: "agate.Table", model
+    ) -> bool:
+        """
+        Insert the rows of a seed as typed columns through the native insert API of the driver,
+        in chunks of `seed_batch_rows` rows spread over `seed_insert_threads` connections.
+        Returns False without inserting anything if a column type of the seed table isn't
+        supported, in which case the rows should be inserted as CSV.
+        """
+        config = model['config']
+        table_columns = {column.name: column for column in self.get_columns_in_relation(relation)}
+        column_names = list(agate_table.column_names)
+        if any(name not in table_columns for name in column_names):
+            return False
+        ch_types = [table_columns[name].ch_type for name in column_names]
+        client = self.connections.get_thread_connection().handle
+        columns = seed_columns(agate_table, ch_types, client.server_timezone())
+        if columns is None:
+            return False
+        if agate_table.rows:
+            self.connections.insert_columns(
+                relation.render(),
+                column_names,
+                [str(ch_type) for ch_type in ch_types],
+                columns,
+                config.get('query_settings') or None,
+                batch_rows=self.seed_batch_rows(model),
+                insert_threads=_int_config(config, 'seed_insert_threads', 1),
+                retries=_int_config(config, 'seed_insert_retries', 0),
+            )
+        return True
+
+    @available
+    def seed_file_format(self, model) -> str:
+        """The ClickHouse input format of the file a seed is loaded from"""
+        return seed_input_format(self._seed_data_path(model))
+
+    @available
+    def seed_file_column_types(self, model) -> Dict[str, str]:
+        """
+        The ClickHouse column types of a Parquet or Arrow seed, from the file metadata and the
+        column_types config.  Empty for CSV seeds, which have no column types in the file
+        """
+        path = self._seed_data_path(model)
+        fmt = seed_input_format(path)
+        if fmt == CSV_FORMAT:
+            return {}
+        return dict(arrow_file_columns(path, fmt, model['config'].get('column_types') or {}))
+
+    @available
+    def load_seed_sample(self, model) -> "agate.Table":
+        """
+        Read the first `seed_sample_rows` rows of a CSV seed, used instead of the complete agate
+        table to infer the column types of seeds streamed from disk.  For Parquet and Arrow seeds
+        this is an empty table with the columns of the file.
+        """
+        import agate
+
+        config = model['config']
+        if self.seed_file_format(model) != CSV_FORMAT:
+            column_names = list(self.seed_file_column_types(model))
+            return agate.Table([], column_names, [agate.Text()] * len(column_names))
+        return sample_csv_table(
+            self._seed_data_path(model),
+            config.get('delimiter') or ',',
+            config.get('column_types') or {},
+            _int_config(config, 'seed_sample_rows', DEFAULT_SEED_SAMPLE_ROWS),
+        )
+
+    @available
+    def insert_seed_file(
+        self, relation: ClickHouseRelation, model, column_names: Sequence[str]
+    ) -> AdapterResponse:
+        """
+        Stream a seed file from disk into the seed table.  The file is parsed by ClickHouse, with
+        the settings required to read empty CSV values and `null` as dbt does
+        """
+        config = model['config']
+        path = self._seed_data_path(model)
+        fmt = seed_input_format(path)
+        if fmt != CSV_FORMAT:
+            return self.connections.insert_file(
+                relation.render(), list(column_names), path, fmt, config.get('query_settings')
+            )
+        settings: Dict[str, Any] = {
+            # Columns are matched by position, since dbt renames duplicate or missing names
+            'input_format_with_names_use_header': 0,
+            'format_csv_null_representation': 'null',
+            'input_format_csv_empty_as_default': 1,
+        }
+        delimiter = config.get('delimiter') or ','
+        if delimiter != ',':
+            settings['format_csv_delimiter'] = delimiter
+        settings.update(config.get('query_settings') or {})
+        return self.connections.insert_file(
+            relation.render(), list(column_names), path, fmt, settings
+        )
+
+    def _seed_data_path(self, model) -> str:
+        """
+        The file the rows of a seed are loaded from.  dbt only finds CSV seeds, so a Parquet or
+        Arrow file is loaded instead of the CSV if it's named by the `seed_file` config (relative
+        to the directory of the CSV file)
+        """
+        csv_path = self._seed_csv_path(model)
+        seed_file = model['config'].get('seed_file')
+        if not seed_file:
+            return csv_path
+        path = os.path.join(os.path.dirname(csv_path), seed_file)
+        if seed_input_format(path) == CSV_FORMAT:
+            raise DbtConfigError(f'seed_file {seed_file} should be a Parquet or Arrow file')
+        return path
+
+    def _seed_csv_path(self, model) -> str:
+        # Resolved in the same way as dbt's load_agate_table
+        package_path = '.'
+        if model['package_name'] != self.config.project_name:
+            package_path = os.path.join(self.config.packages_install_path, model['package_name'])
+        path = os.path.join(self.config.project_root, package_path, model['original_file_path'])
+        if not os.path.exists(path) and model.get('root_path'):
+            path = os.path.join(model['root_path'], model['original_file_path'])
+        return path
+
+    @available
+    def seed_hash(self, model) -> str:
+        """
+        The hash of a seed file and the configs used to load it, which is stored in the comment
+        of the seed table to skip loading unchanged seeds
+        """
+        config = model['config']
+        load_config = {
+            'column_types': config.get('column_types') or {},
+            'delimiter': config.get('delimiter') or ',',
+            'quote_columns': config.get('quote_columns'),
+        }
+        return compute_seed_hash(self._seed_data_path(model), load_config)
+
+    @available
+    def stored_seed_hash(self, relation: ClickHouseRelation) -> Optional[str]:
+        """The seed hash in the comment of an existing seed table, if any"""
+        results = self.execute_macro(
+            'clickhouse__get_relation_comment', kwargs={'relation': relation}
+        )
+        return comment_seed_hash(results[0][0] if results else None)
+
+    @available
+    def seed_hash_comment(self, description: Optional[str], seed_hash: str) -> str:
+        return format_seed_hash_comment(description, seed_hash)
+
+    @available
+    def seed_batch_rows(self, model) -> int:
+        """The maximum number of rows in each insert of a seed, or 0 to insert all rows at once"""
+        return _int_config(model['config'], 'seed_batch_rows', 0)
+
     @available
     def get_csv_data(self, table):
         csv_funcs = [c.csvify for c in table._column_types]
@@ -603,6 +1022,19 @@ def _expect_row_value(key: str, row: "agate.Row"):
     return row[key]
 
 
+def _int_config(config, key: str, default: int) -> int:
+    value = config.get(key)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = -1
+    if value < 0:
+        raise DbtConfigError(f'Invalid {key} {config.get(key)!r}, expected a non-negative integer')
+    return value
+
+
 def _catalog_filter_schemas(
     used_schemas: FrozenSet[Tuple[str, str]]
 ) -> Callable[["agate.Row"], bool]:
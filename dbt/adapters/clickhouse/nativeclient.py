@@ -1,63 +1,157 @@
-from typing import List
+import time
+from importlib import metadata
+from typing import List, Optional
 
 import clickhouse_driver
-import pkg_resources
 from clickhouse_driver.errors import NetworkError, SocketTimeoutError
 from dbt.adapters.__about__ import version as dbt_adapters_version
-from dbt_common.exceptions import DbtDatabaseError
+from dbt_common.exceptions import DbtDatabaseError, DbtRuntimeError
 
 from dbt.adapters.clickhouse import ClickHouseColumn, ClickHouseCredentials
 from dbt.adapters.clickhouse.__version__ import version as dbt_clickhouse_version
-from dbt.adapters.clickhouse.dbclient import ChClientWrapper, ChRetryableException
+from dbt.adapters.clickhouse.dbclient import ChClientWrapper, ChColumnarResult, ChRetryableException
 from dbt.adapters.clickhouse.logger import logger
+from dbt.adapters.clickhouse.query import escape_str, quote_identifier
+from dbt.adapters.clickhouse.seed import csv_record_blocks
+from dbt.adapters.clickhouse.settings import ChSetting
 from dbt.adapters.clickhouse.util import hide_stack_trace
 
 try:
-    driver_version = pkg_resources.get_distribution('clickhouse-driver').version
-except pkg_resources.ResolutionError:
+    driver_version = metadata.version('clickhouse-driver')
+except metadata.PackageNotFoundError:
     driver_version = 'unknown'
 
 
 class ChNativeClient(ChClientWrapper):
     def query(self, sql, **kwargs):
-        try:
-            return NativeClientResult(self._client.execute(sql, with_column_types=True, **kwargs))
-        except clickhouse_driver.errors.Error as ex:
-            err_msg = hide_stack_trace(ex)
-            raise DbtDatabaseError(err_msg) from ex
+        with self._running_query() as query_id:
+            try:
+                result = NativeClientResult(
+                    self._client.execute(sql, with_column_types=True, query_id=query_id, **kwargs)
+                )
+            except clickhouse_driver.errors.Error as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_native_stats(query_id)
+        return result
+
+    def query_columns(self, sql, max_rows=None, **kwargs):
+        if max_rows is None:
+            return self._query_all_columns(sql, **kwargs)
+        truncated = False
+        pre = time.time()
+        with self._running_query() as query_id:
+            try:
+                rows = self._client.execute_iter(
+                    sql, with_column_types=True, query_id=query_id, **kwargs
+                )
+                # Statements that return no data blocks (such as INSERT ... SELECT) yield nothing
+                column_types = next(rows, [])
+                data = []
+                for row in rows:
+                    if len(data) >= max_rows:
+                        truncated = True
+                        self._client.cancel()
+                        break
+                    data.append(row)
+            except clickhouse_driver.errors.Error as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_native_stats(query_id, time.time() - pre)
+        columns = [list(column) for column in zip(*data)] if data else [[] for _ in column_types]
+        return ChColumnarResult(
+            [col[0] for col in column_types], [col[1] for col in column_types], columns, truncated
+        )
+
+    def _query_all_columns(self, sql, **kwargs):
+        with self._running_query() as query_id:
+            try:
+                columns, column_types = self._client.execute(
+                    sql, with_column_types=True, columnar=True, query_id=query_id, **kwargs
+                )
+            except clickhouse_driver.errors.Error as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_native_stats(query_id)
+        if not columns:
+            columns = [[] for _ in column_types]
+        return ChColumnarResult(
+            [col[0] for col in column_types], [col[1] for col in column_types], columns
+        )
 
     def command(self, sql, **kwargs):
-        try:
-            result = self._client.execute(sql, **kwargs)
-            if len(result) and len(result[0]):
-                return result[0][0]
-        except clickhouse_driver.errors.Error as ex:
-            err_msg = hide_stack_trace(ex)
-            raise DbtDatabaseError(err_msg) from ex
+        with self._running_query() as query_id:
+            try:
+                result = self._client.execute(sql, query_id=query_id, **kwargs)
+            except clickhouse_driver.errors.Error as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_native_stats(query_id)
+        if len(result) and len(result[0]):
+            return result[0][0]
 
     def columns_in_query(self, sql: str, **kwargs) -> List[ClickHouseColumn]:
-        try:
-            _, columns = self._client.execute(
-                f"SELECT * FROM ( \n" f"{sql} \n" f") LIMIT 0",
-                with_column_types=True,
+        with self._running_query() as query_id:
+            try:
+                _, columns = self._client.execute(
+                    f"SELECT * FROM ( \n" f"{sql} \n" f") LIMIT 0",
+                    with_column_types=True,
+                    query_id=query_id,
+                )
+                return [ClickHouseColumn.create(column[0], column[1]) for column in columns]
+            except clickhouse_driver.errors.Error as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+
+    def insert(self, table, column_names, column_types, columns, settings=None):
+        column_list = ', '.join(quote_identifier(name) for name in column_names)
+        with self._running_query() as query_id:
+            try:
+                self._client.execute(
+                    f'INSERT INTO {table} ({column_list}) VALUES',
+                    columns,
+                    columnar=True,
+                    query_id=query_id,
+                    settings=settings,
+                )
+            except clickhouse_driver.errors.Error as ex:
+                err_msg = hide_stack_trace(ex)
+                raise DbtDatabaseError(err_msg) from ex
+            self._record_native_stats(query_id)
+
+    def insert_file(self, table, column_names, path, fmt, settings=None):
+        # The native protocol only sends data as Native blocks, so CSV files are sent as inline
+        # data of an INSERT statement, in blocks of complete records
+        if fmt not in ('CSV', 'CSVWithNames'):
+            raise DbtRuntimeError(f'{fmt} files can only be inserted with the http driver')
+        settings = settings or {}
+        delimiter = settings.get('format_csv_delimiter', ',')
+        column_list = ', '.join(quote_identifier(name) for name in column_names)
+        query_id = None
+        written_rows = written_bytes = 0
+        pre = time.time()
+        for block in csv_record_blocks(path, delimiter, skip_header=fmt == 'CSVWithNames'):
+            self.command(
+                f'INSERT INTO {table} ({column_list}) FORMAT CSV\n{block}', settings=settings
             )
-            return [ClickHouseColumn.create(column[0], column[1]) for column in columns]
-        except clickhouse_driver.errors.Error as ex:
-            err_msg = hide_stack_trace(ex)
-            raise DbtDatabaseError(err_msg) from ex
+            query_id = self.last_query_stats.get('query_id')
+            written_rows += self.last_query_stats.get('written_rows') or 0
+            written_bytes += self.last_query_stats.get('written_bytes') or 0
+        self._record_query_stats(
+            query_id,
+            {'written_rows': written_rows, 'written_bytes': written_bytes},
+            time.time() - pre,
+        )
 
-    def get_ch_setting(self, setting_name):
+    def ping(self):
         try:
-            result = self._client.execute(
-                f"SELECT value, readonly FROM system.settings WHERE name = '{setting_name}'"
-            )
-        except clickhouse_driver.errors.Error as ex:
-            logger.warn('Unexpected error retrieving ClickHouse server setting', ex)
-            return None
-        return (result[0][0], result[0][1]) if result else (None, 0)
+            return bool(self._client.connection.ping())
+        except (clickhouse_driver.errors.Error, OSError, EOFError):
+            return False
 
     def close(self):
         self._client.disconnect()
+        super().close()
 
     def _create_client(self, credentials: ClickHouseCredentials):
         client = clickhouse_driver.Client(
@@ -97,6 +191,34 @@ class ChNativeClient(ChClientWrapper):
             f'{server_info.version_major}.{server_info.version_minor}.{server_info.version_patch}'
         )
 
+    def _record_native_stats(self, query_id: str, elapsed: Optional[float] = None):
+        last_query = self._client.last_query
+        if last_query is None:
+            self._record_query_stats(query_id, {}, elapsed)
+            return
+        progress = last_query.progress
+        summary = {
+            'read_rows': progress.rows,
+            'read_bytes': progress.bytes,
+            'written_rows': progress.written_rows,
+            'written_bytes': progress.written_bytes,
+        }
+        self._record_query_stats(query_id, summary, elapsed or last_query.elapsed)
+
+    def _load_settings(self, setting_names):
+        names = ', '.join(f"'{escape_str(setting_name)}'" for setting_name in setting_names)
+        try:
+            result = self._client.execute(
+                f'SELECT name, value, readonly FROM system.settings WHERE name IN ({names})'
+            )
+        except clickhouse_driver.errors.Error as ex:
+            logger.warning(f'Unexpected error retrieving ClickHouse server settings: {ex}')
+            return {}
+        return {row[0]: ChSetting(row[1], bool(row[2])) for row in result}
+
+    def _set_client_setting(self, setting_name, value):
+        self._client.settings[setting_name] = value
+
 
 class NativeClientResult:
     def __init__(self, native_result):
@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from dbt.adapters.clickhouse.credentials import ClickHouseCredentials
+from dbt.adapters.clickhouse.dbclient import ChClientWrapper, get_db_client
+from dbt.adapters.clickhouse.logger import logger
+
+# Idle clients used more recently than this are handed out without a liveness ping
+PING_INTERVAL = 10
+
+
+class ChClientPool:
+    """
+    Thread safe pool of idle ChClientWrapper instances for a single set of credentials.
+
+    The pool never blocks -- if no healthy idle client is available a new one is created. At
+    most `max_idle` clients are retained after release, and retained clients that have been idle
+    for longer than `idle_timeout` seconds are closed instead of being reused.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], ChClientWrapper],
+        max_idle: int,
+        idle_timeout: int,
+        ping_interval: int = PING_INTERVAL,
+    ) -> None:
+        self._factory = factory
+        self._max_idle = max_idle
+        self._idle_timeout = idle_timeout
+        self._ping_interval = ping_interval
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[ChClientWrapper, float]] = []
+
+    def acquire(self) -> ChClientWrapper:
+        while True:
+            with self._lock:
+                expired = self._evict_expired()
+                entry = self._idle.pop() if self._idle else None
+            _close_all(expired)
+            if entry is None:
+                return self._factory()
+            client, released = entry
+            if time.monotonic() - released < self._ping_interval or client.ping():
+                return client
+            logger.debug('Discarding pooled ClickHouse client that failed liveness check')
+            _close_all([client])
+
+    def release(self, client: ChClientWrapper) -> None:
+        with self._lock:
+            expired = self._evict_expired()
+            if len(self._idle) < self._max_idle:
+                self._idle.append((client, time.monotonic()))
+            else:
+                expired.append(client)
+        _close_all(expired)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle = [client for client, _ in self._idle]
+            self._idle.clear()
+        _close_all(idle)
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def _evict_expired(self) -> List[ChClientWrapper]:
+        """Remove and return idle clients past the idle timeout. Callers should hold the lock."""
+        cutoff = time.monotonic() - self._idle_timeout
+        expired = [client for client, released in self._idle if released < cutoff]
+        if expired:
+            self._idle = [entry for entry in self._idle if entry[1] >= cutoff]
+        return expired
+
+
+# Pools are keyed by credentials identity, since get_db_client fills in the driver and port of
+# the credentials object.  Each pool factory holds a reference to its credentials, so the id
+# can't be reused while the pool exists.
+_pools: Dict[int, ChClientPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_client_pool(credentials: ClickHouseCredentials) -> ChClientPool:
+    key = id(credentials)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ChClientPool(
+                lambda: get_db_client(credentials),
+                credentials.pool_size,
+                credentials.pool_idle_timeout,
+            )
+            _pools[key] = pool
+        return pool
+
+
+def close_client_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
+def _close_all(clients: List[ChClientWrapper]) -> None:
+    for client in clients:
+        try:
+            client.close()
+        except Exception as ex:
+            logger.debug(f'Error closing pooled ClickHouse client: {ex}')
@@ -1,3 +1,6 @@
+import re
+from typing import Optional, Set, Tuple
+
 BS = '\\'
 must_escape = (BS, '\'', '`')
 
@@ -12,3 +15,79 @@ def quote_identifier(identifier: str):
 
 def escape_str(value: str):
     return ''.join(f'{BS}{c}' if c in must_escape else c for c in value)
+
+
+_comment_re = re.compile(r'^\s*(?:--[^\n]*(?:\n|$)|/\*.*?\*/)', re.DOTALL)
+_ident = r'(?:`(?:[^`\\]|\\.)*`|"[^"]*"|[\w$]+)'
+_name = rf'{_ident}(?:\s*\.\s*{_ident})?'
+_ddl_re = re.compile(r'^(ALTER|CREATE|ATTACH|DROP|DETACH|RENAME|EXCHANGE)\b', re.IGNORECASE)
+_ddl_target_res = (
+    re.compile(rf'^ALTER\s+TABLE\s+({_name})', re.IGNORECASE),
+    re.compile(
+        rf'^(?:CREATE|ATTACH)\s+(?:OR\s+REPLACE\s+)?(?:TEMPORARY\s+)?'
+        rf'(?:TABLE|VIEW|MATERIALIZED\s+VIEW|LIVE\s+VIEW|WINDOW\s+VIEW|DICTIONARY)\s+'
+        rf'(?:IF\s+NOT\s+EXISTS\s+)?({_name})',
+        re.IGNORECASE,
+    ),
+    re.compile(
+        rf'^(?:DROP|DETACH)\s+(?:TEMPORARY\s+)?(?:TABLE|VIEW|DICTIONARY)\s+(?:IF\s+EXISTS\s+)?'
+        rf'({_name})',
+        re.IGNORECASE,
+    ),
+    re.compile(
+        rf'^(?:RENAME|EXCHANGE)\s+(?:TABLES?|DICTIONARY|DICTIONARIES)\s+({_name})\s+(?:TO|AND)\s+'
+        rf'({_name})',
+        re.IGNORECASE,
+    ),
+)
+_non_relation_ddl_re = re.compile(
+    r'^(?:CREATE|DROP)\s+(?:OR\s+REPLACE\s+)?'
+    r'(?:USER|ROLE|ROW\s+POLICY|POLICY|QUOTA|SETTINGS\s+PROFILE|PROFILE|FUNCTION|NAMED\s+COLLECTION)\b',
+    re.IGNORECASE,
+)
+
+_database_ddl_re = re.compile(
+    r'^(?:ALTER|CREATE|ATTACH|DROP|DETACH|RENAME)\s+DATABASE\b', re.IGNORECASE
+)
+
+
+def ddl_target_relations(sql: str) -> Optional[Set[Tuple[Optional[str], str]]]:
+    """
+    Returns the (schema, identifier) names of the relations whose definition may be changed by
+    a DDL statement, with a None schema for unqualified names.  Returns None if the statement
+    isn't DDL, and an empty set for DDL that may affect relations that can't be determined
+    (such as database level statements, or multiple renames in one statement).
+    """
+    while match := _comment_re.match(sql):
+        sql = sql[match.end() :]
+    sql = sql.lstrip()
+    if not _ddl_re.match(sql) or _non_relation_ddl_re.match(sql):
+        return None
+    for target_re in _ddl_target_res:
+        match = target_re.match(sql)
+        if match:
+            if target_re is _ddl_target_res[3] and ',' in sql[match.end() :]:
+                # Renames of multiple relations
+                return set()
+            return {_split_name(name) for name in match.groups()}
+    return set()
+
+
+def is_database_ddl(sql: str) -> bool:
+    """Whether a statement creates, drops or changes a database"""
+    while match := _comment_re.match(sql):
+        sql = sql[match.end() :]
+    return bool(_database_ddl_re.match(sql.lstrip()))
+
+
+def _split_name(name: str) -> Tuple[Optional[str], str]:
+    parts = [_unquote(part.strip()) for part in re.findall(_ident, name)]
+    if len(parts) == 1:
+        return None, parts[0]
+    return parts[0], parts[1]
+
+
+def _unquote(identifier: str) -> str:
+    if identifier[0] in ('`', '"') and identifier[-1] == identifier[0]:
+        return re.sub(r'\\(.)', r'\1', identifier[1:-1])
+    return identifier
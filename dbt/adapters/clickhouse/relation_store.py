@@ -0,0 +1,55 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+from dbt.adapters.clickhouse.logger import logger
+from dbt.adapters.clickhouse.util import atomic_write_json
+
+RELATION_STORE_FILE = 'clickhouse_relation_cache.json'
+
+
+@dataclass
+class SchemaSnapshot:
+    """
+    The relations of one ClickHouse database, along with the system.tables signature (latest
+    metadata modification time and table count) of the database when they were listed
+    """
+
+    signature: str
+    relations: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class RelationStore:
+    """
+    Relations cache persisted between dbt invocations, usually in the target directory.
+
+    The file is keyed by server and connection properties, and is ignored if they don't match.
+    Each schema snapshot is only reused while the signature of its database is unchanged.
+    """
+
+    def __init__(self, path: str, key: str) -> None:
+        self.path = path
+        self.key = key
+
+    def load(self) -> Dict[str, SchemaSnapshot]:
+        try:
+            with open(self.path) as f:
+                contents = json.load(f)
+            if contents.get('key') != self.key:
+                return {}
+            return {
+                schema: SchemaSnapshot(**snapshot)
+                for schema, snapshot in contents.get('schemas', {}).items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def save(self, snapshots: Dict[str, SchemaSnapshot]) -> None:
+        contents = {
+            'key': self.key,
+            'schemas': {schema: asdict(snapshot) for schema, snapshot in snapshots.items()},
+        }
+        try:
+            atomic_write_json(self.path, contents)
+        except OSError as ex:
+            logger.debug(f'Unable to write ClickHouse relation cache {self.path}: {ex}')
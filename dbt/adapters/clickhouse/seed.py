@@ -0,0 +1,367 @@
+import csv
+import datetime
+import decimal
+import hashlib
+import io
+import itertools
+import json
+import os
+import re
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from dbt_common.exceptions import DbtConfigError, DbtRuntimeError
+
+from dbt.adapters.clickhouse.datatype import ChType
+from dbt.adapters.clickhouse.query import quote_identifier
+from dbt.adapters.clickhouse.util import get_timezone
+
+if TYPE_CHECKING:
+    import agate
+
+Converter = Callable[[Any], Any]
+
+_int_type_re = re.compile(r'^U?Int\d+$')
+_STRING_TYPES = ('String', 'FixedString', 'Enum8', 'Enum16', 'Enum')
+_DECIMAL_TYPES = ('Decimal', 'Decimal32', 'Decimal64', 'Decimal128', 'Decimal256')
+_TRUE_STRINGS = ('1', 'true', 't', 'yes', 'y')
+_EPOCH_DATE = datetime.date(1970, 1, 1)
+_BOM = b'\xef\xbb\xbf'
+
+# Size of the blocks read from seed files and sent to the server
+SEED_BLOCK_SIZE = 1 << 20
+# Number of rows used to infer the column types of seeds streamed from disk
+DEFAULT_SEED_SAMPLE_ROWS = 10000
+# Prefix of the seed hash line in the comment of seed tables
+SEED_HASH_PREFIX = 'dbt_seed_hash: '
+
+CSV_FORMAT = 'CSVWithNames'
+# ClickHouse input formats of seed files, by file extension
+_FILE_FORMATS = {
+    '.csv': CSV_FORMAT,
+    '.parquet': 'Parquet',
+    '.arrow': 'Arrow',
+    '.feather': 'Arrow',
+    '.arrows': 'ArrowStream',
+}
+# Arrow IPC files start with this magic string, while Arrow IPC streams don't
+_ARROW_FILE_MAGIC = b'ARROW1'
+_TIMESTAMP_PRECISION = {'s': 0, 'ms': 3, 'us': 6, 'ns': 9}
+
+
+def seed_columns(
+    agate_table: "agate.Table", column_types: Sequence[ChType], server_tz: datetime.tzinfo
+) -> Optional[List[List[Any]]]:
+    """
+    Convert the rows of a seed table to columns of Python values for the ClickHouse column types,
+    as expected by the native insert APIs of both drivers.  Returns None if any of the column
+    types isn't supported.
+    """
+    converters = []
+    for agate_type, ch_type in zip(agate_table.column_types, column_types):
+        converter = value_converter(ch_type, agate_type, server_tz)
+        if converter is None:
+            return None
+        converters.append(converter)
+    columns: List[List[Any]] = [[] for _ in converters]
+    for row in agate_table.rows:
+        for ix, value in enumerate(row):
+            try:
+                columns[ix].append(converters[ix](value))
+            except (ValueError, TypeError, ArithmeticError) as ex:
+                raise DbtRuntimeError(
+                    f'Invalid value {value!r} for seed column {agate_table.column_names[ix]} '
+                    f'of type {column_types[ix]}: {ex}'
+                ) from ex
+    return columns
+
+
+def value_converter(
+    ch_type: ChType, agate_type: Any, server_tz: datetime.tzinfo
+) -> Optional[Converter]:
+    """
+    Return a function converting seed values to Python values for the ClickHouse type, or None
+    if the type isn't supported.  Nulls in columns that aren't Nullable become the default value
+    of the type, as they do when ClickHouse reads an empty CSV field.
+    """
+    nullable = False
+    while ch_type.name in ('LowCardinality', 'Nullable') and ch_type.type_params:
+        nullable = nullable or ch_type.nullable
+        ch_type = ch_type.type_params[0]
+    name = ch_type.name
+    convert: Converter
+    default: Any
+    if name in _STRING_TYPES:
+        convert, default = _string_converter(agate_type), ''
+    elif _int_type_re.match(name):
+        convert, default = _to_int, 0
+    elif name in ('Float32', 'Float64'):
+        convert, default = float, 0.0
+    elif name in _DECIMAL_TYPES:
+        convert, default = _to_decimal, decimal.Decimal(0)
+    elif name == 'Bool':
+        convert, default = _to_bool, False
+    elif name in ('Date', 'Date32'):
+        convert, default = _to_date, _EPOCH_DATE
+    elif name in ('DateTime', 'DateTime64'):
+        tz = _column_timezone(ch_type) or server_tz
+        convert = _datetime_converter(tz)
+        default = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    elif name == 'UUID':
+        convert, default = _to_uuid, uuid.UUID(int=0)
+    else:
+        return None
+
+    if nullable:
+        return lambda value: None if value is None else convert(value)
+    return lambda value: default if value is None else convert(value)
+
+
+def _string_converter(agate_type: Any) -> Converter:
+    def convert(value: Any) -> str:
+        if isinstance(value, str):
+            return value
+        # The same text as the CSV serialization of the value
+        return str(agate_type.csvify(value))
+
+    return convert
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, str):
+        return int(decimal.Decimal(value))
+    return int(value)
+
+
+def _to_decimal(value: Any) -> decimal.Decimal:
+    if isinstance(value, float):
+        return decimal.Decimal(str(value))
+    return decimal.Decimal(value)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+def _to_date(value: Any) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+def _to_uuid(value: Any) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def _datetime_converter(tz: datetime.tzinfo) -> Converter:
+    def convert(value: Any) -> datetime.datetime:
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+        elif not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time())
+        # Naive values are in the column (or server) time zone, as they are when read from CSV
+        return value if value.tzinfo else value.replace(tzinfo=tz)
+
+    return convert
+
+
+def _column_timezone(ch_type: ChType) -> Optional[datetime.tzinfo]:
+    for param in ch_type.params:
+        if isinstance(param, str) and param.startswith("'"):
+            return get_timezone(param.strip("'"))
+    return None
+
+
+def sample_csv_table(
+    path: str, delimiter: str, text_columns: Iterable[str], sample_rows: int
+) -> "agate.Table":
+    """
+    Read the first `sample_rows` rows of a CSV seed file into an agate table, with the same type
+    inference dbt uses for the whole file
+    """
+    import agate
+    from dbt_common.clients.agate_helper import build_type_tester
+
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header: List[str] = next(reader, [])
+        rows = list(itertools.islice(reader, sample_rows))
+    type_tester = build_type_tester(text_columns=text_columns)
+    return agate.Table(rows, header, column_types=type_tester)
+
+
+def file_blocks(path: str, block_size: int = SEED_BLOCK_SIZE) -> Iterator[bytes]:
+    """Read a file in fixed size blocks, without any leading UTF-8 byte order mark"""
+    with open(path, 'rb') as f:
+        block = f.read(block_size)
+        if block.startswith(_BOM):
+            block = block[len(_BOM) :]
+        while block:
+            yield block
+            block = f.read(block_size)
+
+
+def csv_record_blocks(
+    path: str, delimiter: str = ',', skip_header: bool = True, block_size: int = SEED_BLOCK_SIZE
+) -> Iterator[str]:
+    """
+    Read a CSV file in blocks of about `block_size` bytes that only contain complete records, for
+    clients that insert each block separately.  Quoted values may contain line breaks, so the
+    records are parsed and written again with the same delimiter.
+    """
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        if skip_header:
+            next(reader, None)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=delimiter, lineterminator='\n')
+        for record in reader:
+            if not record:
+                continue
+            writer.writerow(record)
+            if buffer.tell() >= block_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+def compute_seed_hash(path: str, load_config: Dict[str, Any]) -> str:
+    """A hash of the contents of a seed file and of the seed configs that affect how it's loaded"""
+    digest = hashlib.sha256()
+    for block in file_blocks(path):
+        digest.update(block)
+    digest.update(json.dumps(load_config, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def comment_seed_hash(comment: Optional[str]) -> Optional[str]:
+    """The seed hash stored in the last line of a table comment, if any"""
+    if not comment:
+        return None
+    last_line = comment.rsplit('\n', 1)[-1]
+    if last_line.startswith(SEED_HASH_PREFIX):
+        return last_line[len(SEED_HASH_PREFIX) :]
+    return None
+
+
+def format_seed_hash_comment(description: Optional[str], seed_hash: str) -> str:
+    """A table comment with the seed hash on its own line after the (persisted) description"""
+    hash_line = f'{SEED_HASH_PREFIX}{seed_hash}'
+    return f'{description}\n{hash_line}' if description else hash_line
+
+
+def seed_input_format(path: str) -> str:
+    """The ClickHouse input format of a seed file, based on its extension"""
+    fmt = _FILE_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise DbtConfigError(
+            f'Unsupported seed file {path}, expected a .csv, .parquet, .arrow or .arrows file'
+        )
+    if fmt == 'Arrow' and os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read(len(_ARROW_FILE_MAGIC)) != _ARROW_FILE_MAGIC:
+                fmt = 'ArrowStream'
+    return fmt
+
+
+def arrow_file_columns(path: str, fmt: str, column_types: Dict[str, str]) -> List[Tuple[str, str]]:
+    """
+    The names and ClickHouse types of the columns of a Parquet or Arrow seed file, read from the
+    schema in the file metadata without reading any rows.  Types in column_types take precedence.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as ex:
+        raise DbtRuntimeError(
+            'Parquet and Arrow seeds require the pyarrow package, which is installed with '
+            '`pip install dbt-clickhouse[arrow]`'
+        ) from ex
+
+    if fmt == 'Parquet':
+        schema = pyarrow.parquet.read_schema(path)
+    else:
+        with pyarrow.OSFile(path) as f:
+            if fmt == 'Arrow':
+                schema = pyarrow.ipc.open_file(f).schema
+            else:
+                schema = pyarrow.ipc.open_stream(f).schema
+    return [
+        (field.name, column_types.get(field.name) or _arrow_ch_type(field.type, field.nullable))
+        for field in schema
+    ]
+
+
+def _arrow_ch_type(arrow_type: Any, nullable: bool) -> str:
+    """
+    The ClickHouse type for an Arrow type, matching the types ClickHouse infers when reading
+    Arrow and Parquet data
+    """
+    import pyarrow.types as pa_types
+
+    if pa_types.is_dictionary(arrow_type):
+        return f'LowCardinality({_arrow_ch_type(arrow_type.value_type, nullable)})'
+    if pa_types.is_list(arrow_type) or pa_types.is_large_list(arrow_type):
+        return f'Array({_arrow_ch_type(arrow_type.value_type, True)})'
+    if pa_types.is_map(arrow_type):
+        key_type = _arrow_ch_type(arrow_type.key_type, False)
+        return f'Map({key_type}, {_arrow_ch_type(arrow_type.item_type, True)})'
+    if pa_types.is_struct(arrow_type):
+        elements = ', '.join(
+            f'{quote_identifier(field.name)} {_arrow_ch_type(field.type, field.nullable)}'
+            for field in arrow_type
+        )
+        return f'Tuple({elements})'
+
+    if pa_types.is_boolean(arrow_type):
+        ch_type = 'Bool'
+    elif pa_types.is_integer(arrow_type):
+        sign = 'Int' if pa_types.is_signed_integer(arrow_type) else 'UInt'
+        ch_type = f'{sign}{arrow_type.bit_width}'
+    elif pa_types.is_float16(arrow_type) or pa_types.is_float32(arrow_type):
+        ch_type = 'Float32'
+    elif pa_types.is_float64(arrow_type):
+        ch_type = 'Float64'
+    elif pa_types.is_decimal(arrow_type):
+        ch_type = f'Decimal({arrow_type.precision}, {arrow_type.scale})'
+    elif pa_types.is_date32(arrow_type):
+        ch_type = 'Date32'
+    elif pa_types.is_date64(arrow_type):
+        ch_type = 'DateTime64(3)'
+    elif pa_types.is_timestamp(arrow_type):
+        precision = _TIMESTAMP_PRECISION[arrow_type.unit]
+        tz = f", '{arrow_type.tz}'" if arrow_type.tz else ''
+        ch_type = f'DateTime64({precision}{tz})'
+    elif pa_types.is_fixed_size_binary(arrow_type):
+        ch_type = f'FixedString({arrow_type.byte_width})'
+    elif (
+        pa_types.is_string(arrow_type)
+        or pa_types.is_large_string(arrow_type)
+        or pa_types.is_binary(arrow_type)
+        or pa_types.is_large_binary(arrow_type)
+    ):
+        ch_type = 'String'
+    else:
+        raise DbtRuntimeError(
+            f'Unsupported Arrow type {arrow_type} in seed file, the ClickHouse type of the column '
+            'should be set in column_types'
+        )
+    return f'Nullable({ch_type})' if nullable else ch_type
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Set
+
+LW_DELETE_SETTING = 'allow_experimental_lightweight_delete'
+ND_MUTATION_SETTING = 'allow_nondeterministic_mutations'
+INSERT_DISTRIBUTED_SYNC_SETTING = 'insert_distributed_sync'
+
+# Server settings read by the adapter and its macros, loaded together when a connection first
+# needs any setting
+SNAPSHOT_SETTINGS = (
+    LW_DELETE_SETTING,
+    ND_MUTATION_SETTING,
+    INSERT_DISTRIBUTED_SYNC_SETTING,
+    'mutations_sync',
+    'replicated_deduplication_window',
+    'database_replicated_enforce_synchronous_settings',
+)
+
+
+@dataclass
+class ChSetting:
+    value: str
+    readonly: bool = False
+
+
+class ServerSettings:
+    """
+    Snapshot of the effective ClickHouse settings for a single connection.  The snapshot is
+    loaded with a single query the first time it is used. Settings outside the snapshot are
+    loaded individually on first use and then added to the snapshot.
+    """
+
+    def __init__(self, loader: Callable[[Iterable[str]], Dict[str, ChSetting]]) -> None:
+        self._loader = loader
+        self._settings: Optional[Dict[str, ChSetting]] = None
+        self._missing: Set[str] = set()
+        # Settings changed by the adapter before the snapshot was loaded
+        self._pending: Dict[str, str] = {}
+
+    def get(self, name: str) -> Optional[ChSetting]:
+        if self._settings is None:
+            self._settings = self._loader(SNAPSHOT_SETTINGS)
+            self._missing.update(set(SNAPSHOT_SETTINGS) - set(self._settings))
+            for pending_name, value in self._pending.items():
+                self._set(self._settings, pending_name, value)
+            self._pending.clear()
+        if name not in self._settings and name not in self._missing:
+            loaded = self._loader((name,))
+            self._settings.update(loaded)
+            if name not in loaded:
+                self._missing.add(name)
+        return self._settings.get(name)
+
+    def get_str(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        setting = self.get(name)
+        return default if setting is None else setting.value
+
+    def get_int(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        setting = self.get(name)
+        if setting is None:
+            return default
+        try:
+            return int(setting.value)
+        except ValueError:
+            return default
+
+    def get_bool(self, name: str, default: bool = False) -> bool:
+        setting = self.get(name)
+        if setting is None:
+            return default
+        return setting.value.lower() in ('1', 'true')
+
+    def is_readonly(self, name: str) -> bool:
+        setting = self.get(name)
+        return setting is not None and setting.readonly
+
+    def update(self, name: str, value: str) -> None:
+        """
+        Record a setting changed by the adapter for this connection.  The snapshot isn't loaded
+        just to record the change, which is applied when the snapshot is loaded
+        """
+        if self._settings is None:
+            self._pending[name] = value
+        else:
+            self._set(self._settings, name, value)
+
+    def _set(self, settings: Dict[str, ChSetting], name: str, value: str) -> None:
+        setting = settings.get(name)
+        settings[name] = ChSetting(value, setting.readonly if setting else False)
+        self._missing.discard(name)
@@ -1,4 +1,8 @@
+import json
 import os
+from datetime import tzinfo
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from dbt_common.exceptions import DbtRuntimeError
 
@@ -22,3 +26,29 @@ def hide_stack_trace(ex: Exception) -> str:
 
     err_msg = str(ex).split("Stack trace")[0].strip()
     return err_msg
+
+
+def get_timezone(name: str) -> tzinfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise DbtRuntimeError(f'Unknown ClickHouse time zone {name}')
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """
+    Write data to a JSON file through a temporary file, so that readers (including other dbt
+    processes) never see a partially written file.  Raises OSError if the file can't be written
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    dir_name = os.path.dirname(path)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
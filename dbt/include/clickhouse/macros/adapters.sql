@@ -20,7 +20,11 @@
 {% endmacro %}
 
 {% macro clickhouse__list_relations_without_caching(schema_relation) %}
-  {% call statement('list_relations_without_caching', fetch_result=True) -%}
+  {{ return(list_relations_in_schemas([schema_relation.schema])) }}
+{% endmacro %}
+
+{% macro list_relations_in_schemas(schemas, identifier=none) %}
+  {% call statement('list_relations_in_schemas', fetch_result=True) -%}
     select
       t.name as name,
       t.database as schema,
@@ -31,19 +35,40 @@
       ) as type,
       db.engine as db_engine,
       {%- if adapter.get_clickhouse_cluster_name() -%}
-        count(distinct _shard_num) > 1  as  is_on_cluster
+        count(distinct _shard_num) > 1  as  is_on_cluster,
+        any(arrayZip(t.dependencies_database, t.dependencies_table)) as dependents
         from clusterAllReplicas({{ adapter.get_clickhouse_cluster_name() }}, system.tables) as t
           join system.databases as db on t.database = db.name
-        where schema = '{{ schema_relation.schema }}'
+        where schema in ({%- for schema in schemas -%}'{{ schema }}'{{ ', ' if not loop.last }}{%- endfor -%})
+        {%- if identifier %} and t.name = '{{ identifier }}'{% endif %}
         group by name, schema, type, db_engine
       {%- else -%}
-        0 as is_on_cluster
+        0 as is_on_cluster,
+        arrayZip(t.dependencies_database, t.dependencies_table) as dependents
           from system.tables as t join system.databases as db on t.database = db.name
-        where schema = '{{ schema_relation.schema }}'
+        where schema in ({%- for schema in schemas -%}'{{ schema }}'{{ ', ' if not loop.last }}{%- endfor -%})
+        {%- if identifier %} and t.name = '{{ identifier }}'{% endif %}
       {% endif %}
 
   {% endcall %}
-  {{ return(load_result('list_relations_without_caching').table) }}
+  {{ return(load_result('list_relations_in_schemas').table) }}
+{% endmacro %}
+
+{% macro get_schema_signatures(schemas) %}
+  {% call statement('get_schema_signatures', fetch_result=True) -%}
+    select
+      database,
+      toString(max(metadata_modification_time)) as modified,
+      count() as tables
+    {%- if adapter.get_clickhouse_cluster_name() %}
+      from clusterAllReplicas({{ adapter.get_clickhouse_cluster_name() }}, system.tables)
+    {%- else %}
+      from system.tables
+    {%- endif %}
+    where database in ({%- for schema in schemas -%}'{{ schema }}'{{ ', ' if not loop.last }}{%- endfor -%})
+    group by database
+  {% endcall %}
+  {{ return(load_result('get_schema_signatures').table) }}
 {% endmacro %}
 
 {% macro clickhouse__get_columns_in_relation(relation) -%}
@@ -57,6 +82,15 @@
   {{ return(sql_convert_columns_in_relation(load_result('get_columns').table)) }}
 {% endmacro %}
 
+{% macro get_columns_in_schemas(schemas) -%}
+  {% call statement('get_columns_in_schemas', fetch_result=True) %}
+    select database, table, name, type from system.columns
+    where database in ({%- for schema in schemas -%}'{{ schema }}'{{ ', ' if not loop.last }}{%- endfor -%})
+    order by database, table, position
+  {% endcall %}
+  {{ return(load_result('get_columns_in_schemas').table) }}
+{% endmacro %}
+
 {% macro clickhouse__drop_relation(relation, obj_type='table') -%}
   {% call statement('drop_relation', auto_begin=False) -%}
     drop {{ obj_type }} if exists {{ relation }} {{ on_cluster_clause(relation, True)}}
@@ -24,4 +24,21 @@
         where name = '{{ database }}'
    {% endcall %}
    {% do return(load_result('get_database').table) %}
+{% endmacro %}
+
+{% macro clickhouse__get_databases() %}
+    {% call statement('get_databases', fetch_result=True) %}
+        select name, engine, comment
+        from system.databases
+   {% endcall %}
+   {% do return(load_result('get_databases').table) %}
+{% endmacro %}
+
+{% macro clickhouse__get_relation_comment(relation) %}
+    {% call statement('get_relation_comment', fetch_result=True) %}
+        select comment
+        from system.tables
+        where database = '{{ relation.schema }}' and name = '{{ relation.identifier }}'
+   {% endcall %}
+   {% do return(load_result('get_relation_comment').table) %}
 {% endmacro %}
\ No newline at end of file
@@ -1,5 +1,5 @@
 {% materialization distributed_incremental, adapter='clickhouse' %}
-  {% set insert_distributed_sync = run_query("SELECT value FROM system.settings WHERE name = 'insert_distributed_sync'")[0][0] %}
+  {% set insert_distributed_sync = adapter.get_server_setting('insert_distributed_sync') %}
   {% if insert_distributed_sync != '1' %}
      {% do exceptions.raise_compiler_error('To use distributed materialization setting insert_distributed_sync should be set to 1') %}
   {% endif %}
@@ -62,6 +62,9 @@
     {{ log('Searching for existing materialized views with the pattern of ' + target_relation.name) }}
     {{ log('Views dictionary contents: ' + views | string) }}
 
+    {# the relations cache usually has the views of the schema, otherwise query information_schema #}
+    {% set tables = adapter.get_cached_views_like(target_relation) %}
+    {% if tables is none %}
         {% set tables_query %}
             select table_name
             from information_schema.tables
@@ -69,10 +72,12 @@
               and table_name like '%{{ target_relation.name }}%'
               and table_type = 'VIEW'
         {% endset %}
-
-    {% set tables_result = run_query(tables_query) %}
-    {% if tables_result is not none and tables_result.columns %}
-        {% set tables = tables_result.columns[0].values() %}
+        {% set tables_result = run_query(tables_query) %}
+        {% if tables_result is not none and tables_result.columns %}
+            {% set tables = tables_result.columns[0].values() %}
+        {% endif %}
+    {% endif %}
+    {% if tables %}
         {{ log('Current mvs found in ClickHouse are: ' + tables | join(', ')) }}
         {% set mv_names = [] %}
         {% for key in views.keys() %}
@@ -1,8 +1,112 @@
+{% materialization seed, adapter='clickhouse' %}
+
+  {%- set identifier = model['alias'] -%}
+  {%- set full_refresh_mode = (should_full_refresh()) -%}
+
+  {%- set old_relation = adapter.get_relation(database=database, schema=schema, identifier=identifier) -%}
+
+  {%- set exists_as_table = (old_relation is not none and old_relation.is_table) -%}
+  {%- set exists_as_view = (old_relation is not none and old_relation.is_view) -%}
+
+  {%- set grant_config = config.get('grants') -%}
+  {#- Seeds are only loaded again if the hash of the file and its configs doesn't match the hash
+      stored in the comment of the existing table -#}
+  {%- set seed_hash = adapter.seed_hash(model) if config.get('seed_skip_unchanged', false) else none -%}
+  {%- set stored_hash = adapter.stored_seed_hash(old_relation) if (seed_hash and exists_as_table) else none -%}
+  {%- set unchanged = seed_hash is not none and seed_hash == stored_hash and not full_refresh_mode -%}
+  {#- Streamed seeds are only read from disk while inserting, the agate table is a sample used
+      to infer the column types.  Parquet and Arrow seed files are always streamed -#}
+  {%- set stream_seed = config.get('seed_streaming', false) or adapter.seed_file_format(model) != 'CSVWithNames' -%}
+  {%- if stream_seed or unchanged -%}
+    {%- set agate_table = adapter.load_seed_sample(model) -%}
+  {%- else -%}
+    {%- set agate_table = load_agate_table() -%}
+  {%- endif -%}
+
+  {%- do store_result('agate_table', response='OK', agate_table=agate_table) -%}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+
+  -- `BEGIN` happens here:
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  -- build model
+  {% set create_table_sql = "" %}
+  {% if unchanged %}
+    {{ log("Seed " ~ old_relation.render() ~ " is unchanged, skipping load") }}
+  {% elif exists_as_view %}
+    {{ exceptions.raise_compiler_error("Cannot seed to '{}', it is a view".format(old_relation.render())) }}
+  {% elif exists_as_table %}
+    {% if stored_hash is not none and not full_refresh_mode %}
+      {#- Don't leave the old hash on a table that may only be partially loaded -#}
+      {% do run_query(one_alter_relation(old_relation, "modify comment ''")) %}
+    {% endif %}
+    {% set create_table_sql = reset_csv_table(model, full_refresh_mode, old_relation, agate_table) %}
+  {% else %}
+    {% set create_table_sql = create_csv_table(model, agate_table) %}
+  {% endif %}
+
+  {% set code = 'CREATE' if full_refresh_mode else 'INSERT' %}
+  {% set sql = "" %}
+  {% if unchanged %}
+    {% set code = 'UNCHANGED' %}
+    {% set rows_affected = 0 %}
+  {% elif stream_seed %}
+    {% set response = adapter.insert_seed_file(this, model, agate_table.column_names) %}
+    {% set rows_affected = response.rows_affected or 0 %}
+  {% else %}
+    {% set rows_affected = (agate_table.rows | length) %}
+    {% if rows_affected > 0 %}
+      {% set sql = load_csv_rows(model, agate_table) %}
+    {% endif %}
+  {% endif %}
+
+  {% call noop_statement('main', code ~ ' ' ~ rows_affected, code, rows_affected) %}
+    {{ get_csv_sql(create_table_sql, sql) }};
+  {% endcall %}
+
+  {% set target_relation = this.incorporate(type='table') %}
+
+  {% set should_revoke = should_revoke(old_relation, full_refresh_mode) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+
+  {% do persist_docs(target_relation, model) %}
+
+  {% if seed_hash is not none and (not unchanged or config.persist_relation_docs()) %}
+    {%- set description = model.description if config.persist_relation_docs() else none -%}
+    {%- set comment = adapter.seed_hash_comment(description, seed_hash) -%}
+    {% do run_query(one_alter_relation(target_relation, "modify comment " ~ clickhouse_escape_comment(comment))) %}
+  {% endif %}
+
+  {% if full_refresh_mode or not exists_as_table %}
+    {% do create_indexes(target_relation) %}
+  {% endif %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  -- `COMMIT` happens here
+  {{ adapter.commit() }}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmaterialization %}
+
 {% macro clickhouse__load_csv_rows(model, agate_table) %}
+  {% if not adapter.insert_seed_columns(this, agate_table, model) %}
+    {{ clickhouse__insert_csv_rows(model, agate_table) }}
+  {% endif %}
+{% endmacro %}
+
+{% macro clickhouse__insert_csv_rows(model, agate_table) %}
   {% set cols_sql = get_seed_column_quoted_csv(model, agate_table.column_names) %}
-  {% set data_sql = adapter.get_csv_data(agate_table) %}
+  {% set row_count = agate_table.rows | length %}
+  {% set batch_rows = adapter.seed_batch_rows(model) or row_count or 1 %}
 
-  {% if data_sql %}
+  {% for start in range(0, row_count, batch_rows) %}
+    {% set chunk = agate_table.limit(start, start + batch_rows) if batch_rows < row_count else agate_table %}
+    {% set data_sql = adapter.get_csv_data(chunk) %}
     {% set sql -%}
       insert into {{ this.render() }} ({{ cols_sql }})
       {{ adapter.get_model_query_settings(model) }}
@@ -10,19 +114,20 @@
       {{ data_sql }}
     {%- endset %}
 
-    {% do adapter.add_query(sql, bindings=agate_table, abridge_sql_log=True) %}
-  {% endif %}
+    {% do adapter.add_query(sql, bindings=chunk, abridge_sql_log=True) %}
+  {% endfor %}
 {% endmacro %}
 
 {% macro clickhouse__create_csv_table(model, agate_table) %}
   {%- set column_override = model['config'].get('column_types', {}) -%}
   {%- set quote_seed_column = model['config'].get('quote_columns', None) -%}
+  {%- set file_types = adapter.seed_file_column_types(model) -%}
 
   {% set sql %}
     create table {{ this.render() }} {{ on_cluster_clause(this) }} (
       {%- for col_name in agate_table.column_names -%}
         {%- set inferred_type = adapter.convert_type(agate_table, loop.index0) -%}
-        {%- set type = column_override.get(col_name, inferred_type) -%}
+        {%- set type = column_override.get(col_name, file_types.get(col_name) or inferred_type) -%}
         {%- set column_name = (col_name | string) -%}
           {{ adapter.quote_seed_column(column_name, quote_seed_column) }} {{ type }} {%- if not loop.last -%}, {%- endif -%}
       {%- endfor -%}
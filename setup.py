@@ -2,6 +2,7 @@
 
 import os
 import re
+from typing import Any
 
 from setuptools import find_namespace_packages, setup
 
@@ -33,6 +34,12 @@ if not package_version.startswith(dbt_minor_version):
         f'dbt_version={dbt_minor_version}'
     )
 
+# Optional dependencies, installed with `pip install dbt-clickhouse[<extra>]`.  Typed as Any since
+# a dict doesn't match the setuptools stubs' protocol for extras_require with the pinned mypy
+extras_require: Any = {
+    'arrow': ['pyarrow>=12.0.0'],
+}
+
 
 setup(
     name=package_name,
@@ -56,8 +63,8 @@ setup(
         f'dbt-core>={dbt_minor_version}',
         'clickhouse-connect>=0.6.22',
         'clickhouse-driver>=0.2.6',
-        'setuptools>=0.69',
     ],
+    extras_require=extras_require,
     python_requires=">=3.9",
     platforms='any',
     classifiers=[
@@ -1,7 +1,7 @@
 import os
 
 import pytest
-from dbt.tests.util import run_dbt
+from dbt.tests.util import run_dbt, write_file
 
 # CSV content with boolean column type.
 seeds_boolean_csv = """
@@ -59,6 +59,57 @@ seeds:
 """
 
 
+batched_seeds_schema_yml = """
+version: 2
+
+seeds:
+  - name: empty
+    config:
+      seed_batch_rows: 2
+      seed_insert_threads: 2
+      seed_insert_retries: 1
+      column_types:
+        val2: Nullable(UInt32)
+        str1: Nullable(String)
+"""
+
+streamed_seeds_schema_yml = """
+version: 2
+
+seeds:
+  - name: empty
+    config:
+      seed_streaming: true
+      seed_sample_rows: 3
+      column_types:
+        val2: Nullable(UInt32)
+        str1: Nullable(String)
+"""
+
+parquet_seeds_schema_yml = """
+version: 2
+
+seeds:
+  - name: events
+    config:
+      seed_file: events.parquet
+      column_types:
+        name: LowCardinality(String)
+"""
+
+unchanged_seeds_schema_yml = """
+version: 2
+
+seeds:
+  - name: boolean
+    description: Boolean seed
+    config:
+      seed_skip_unchanged: true
+      persist_docs:
+        relation: true
+"""
+
+
 class TestCSVSeed:
     @pytest.fixture(scope="class")
     def seeds(self):
@@ -95,3 +146,112 @@ class TestReplicatedCSVSeed:
         columns = project.run_sql("DESCRIBE TABLE empty", fetch='all')
         assert columns[2][1] == 'Nullable(UInt32)'
         assert columns[3][1] == 'Nullable(String)'
+
+
+class TestBatchedCSVSeed:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {
+            "schema.yml": batched_seeds_schema_yml,
+            "empty.csv": seeds_empty_csv,
+        }
+
+    def test_seed(self, project):
+        results = run_dbt(["seed"])
+        assert len(results) == 1
+        result = project.run_sql("SELECT count(), countIf(val2 IS NULL) FROM empty", fetch='one')
+        assert result == (7, 2)
+
+
+class TestStreamedCSVSeed:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {
+            "schema.yml": streamed_seeds_schema_yml,
+            "empty.csv": seeds_empty_csv,
+        }
+
+    def test_seed(self, project):
+        results = run_dbt(["seed"])
+        assert len(results) == 1
+        assert results[0].adapter_response['rows_affected'] == 7
+        columns = project.run_sql("DESCRIBE TABLE empty", fetch='all')
+        assert [column[1] for column in columns] == [
+            'String',
+            'Int32',
+            'Nullable(UInt32)',
+            'Nullable(String)',
+        ]
+        result = project.run_sql(
+            "SELECT count(), countIf(val2 IS NULL), countIf(str1 IS NULL) FROM empty", fetch='one'
+        )
+        assert result == (7, 2, 1)
+
+
+class TestUnchangedCSVSeed:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {
+            "schema.yml": unchanged_seeds_schema_yml,
+            "boolean.csv": seeds_boolean_csv,
+        }
+
+    def test_seed(self, project):
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response['rows_affected'] == 4
+        comment = project.run_sql(
+            "SELECT comment FROM system.tables WHERE database = currentDatabase() "
+            "AND name = 'boolean'",
+            fetch='one',
+        )[0]
+        assert comment.startswith('Boolean seed\ndbt_seed_hash: ')
+
+        project.run_sql("INSERT INTO boolean VALUES ('xyz', true)")
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response['code'] == 'UNCHANGED'
+        assert project.run_sql("SELECT count() FROM boolean", fetch='one')[0] == 5
+
+        write_file(seeds_boolean_csv + 'nop,true\n', project.project_root, 'seeds', 'boolean.csv')
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response['rows_affected'] == 5
+        assert project.run_sql("SELECT count() FROM boolean", fetch='one')[0] == 5
+
+
+class TestParquetSeed:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {
+            "schema.yml": parquet_seeds_schema_yml,
+            "events.csv": "id,name,tags,amount\n",
+        }
+
+    def test_seed(self, project, test_config):
+        if test_config['driver'] == 'native':
+            pytest.skip('Parquet seeds require the http driver')
+        pyarrow = pytest.importorskip('pyarrow')
+        import pyarrow.parquet
+
+        table = pyarrow.table(
+            {
+                'id': pyarrow.array([1, 2, 3], pyarrow.uint32()),
+                'name': ['a', 'b', None],
+                'tags': [['x'], [], ['y', 'z']],
+                'amount': pyarrow.array([1.5, None, 3.0], pyarrow.float64()),
+            }
+        )
+        pyarrow.parquet.write_table(
+            table, os.path.join(project.project_root, 'seeds', 'events.parquet')
+        )
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response['rows_affected'] == 3
+        columns = project.run_sql("DESCRIBE TABLE events", fetch='all')
+        assert [column[1] for column in columns] == [
+            'Nullable(UInt32)',
+            'LowCardinality(String)',
+            'Array(Nullable(String))',
+            'Nullable(Float64)',
+        ]
+        result = project.run_sql(
+            "SELECT sum(id), countIf(amount IS NULL), sum(length(tags)) FROM events", fetch='one'
+        )
+        assert result == (6, 1, 3)
@@ -97,3 +97,109 @@ class TestCachingSelectedSchemaOnly(BaseCachingTest):
         # this should only cache the schema containing the selected model
         run_args = ["--cache-selected-only", "run", "--select", "model"]
         self.run_and_inspect_cache(project, run_args)
+
+
+class TestCachingMultipleSchemas(BaseCachingTest):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "model.sql": model_sql,
+            "another_schema_model.sql": another_schema_model_sql,
+        }
+
+    def test_cache(self, project):
+        # both schemas are populated by a single bulk query
+        run_dbt(["run"])
+        run_dbt(["run"])
+        adapter = project.adapter
+        schemas = {relation.schema for relation in adapter.cache.relations}
+        assert schemas == {project.test_schema, f"{project.test_schema}_another_schema"}
+        assert len(adapter.cache.relations) == 2
+
+
+class TestPersistedRelationCache(BaseCachingTest):
+    @pytest.fixture(scope="class")
+    def profiles_config_update(self, dbt_profile_target):
+        outputs = {"default": {**dbt_profile_target, "persist_relation_cache": True}}
+        return {"test": {"outputs": outputs, "target": "default"}}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "model.sql": model_sql,
+        }
+
+    def test_cache(self, project):
+        super().test_cache(project)
+        # the third run reuses the relations saved by the second run
+        run_dbt(["run"])
+        assert len(project.adapter.cache.relations) == 1
+
+
+class TestCachingRelationLookup(BaseCachingTest):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "model.sql": model_sql,
+        }
+
+    def test_cache(self, project):
+        super().test_cache(project)
+        adapter = project.adapter
+        with adapter.connection_named("test_relation_lookup"):
+            # relations in schemas outside the project are looked up individually
+            relation = adapter.get_relation("", "system", "one")
+            assert relation.identifier == "one"
+            assert ("", "system") not in adapter.cache
+            assert adapter.cache.get_cached_relation("system", "one") is not None
+
+            assert adapter.get_relation("", "system", "not_a_table") is None
+            assert adapter.cache.is_missing("system", "not_a_table")
+
+
+class TestDatabaseCatalog(BaseCachingTest):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "model.sql": model_sql,
+        }
+
+    def test_cache(self, project):
+        adapter = project.adapter
+        schema = f"{project.test_schema}_macro_db"
+        relation = adapter.Relation.create(database="", schema=schema)
+        with adapter.connection_named("test_database_catalog"):
+            assert adapter.check_schema_exists("", project.test_schema)
+            assert adapter.cache.get_databases() is not None
+            # the create_schema macro runs the DDL without the adapter create_schema method
+            adapter.execute_macro("create_schema", kwargs={"relation": relation})
+            try:
+                assert adapter.check_schema_exists("", schema)
+                assert adapter.get_ch_database(schema).name == schema
+            finally:
+                adapter.drop_schema(relation)
+            assert not adapter.check_schema_exists("", schema)
+
+
+class TestPrefetchColumns(BaseCachingTest):
+    @pytest.fixture(scope="class")
+    def profiles_config_update(self, dbt_profile_target):
+        outputs = {"default": {**dbt_profile_target, "prefetch_columns": True}}
+        return {"test": {"outputs": outputs, "target": "default"}}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "model.sql": model_sql,
+        }
+
+    def test_cache(self, project):
+        super().test_cache(project)
+        adapter = project.adapter
+        adapter.cache.clear()
+        schema_relation = adapter.Relation.create(database="", schema=project.test_schema)
+        adapter._relations_cache_for_schemas([], {schema_relation})
+        relation = adapter.cache.get_cached_relation(project.test_schema, "model")
+        # the columns were loaded with the relations of the schema
+        columns = adapter.cache.get_columns(relation)
+        assert [column.name for column in columns] == ["id"]
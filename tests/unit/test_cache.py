@@ -0,0 +1,214 @@
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from dbt.adapters.clickhouse.cache import CachedRelation, ClickHouseRelationsCache
+from dbt.adapters.clickhouse.relation import ClickHouseRelation, ClickHouseRelationType
+
+
+class FakeRelation(SimpleNamespace):
+    def incorporate(self, path):
+        return FakeRelation(schema=self.schema, identifier=path['identifier'])
+
+
+def _relation(schema, identifier):
+    return FakeRelation(schema=schema, identifier=identifier)
+
+
+def _identifiers(cache, schema):
+    return sorted(relation.identifier for relation in cache.get_relations(None, schema))
+
+
+def test_schema_index():
+    cache = ClickHouseRelationsCache()
+    cache.add(_relation('db1', 'a'))
+    cache.add(_relation('db1', 'b'))
+    cache.add(_relation('db2', 'a'))
+    assert _identifiers(cache, 'db1') == ['a', 'b']
+    cache.rename(_relation('db1', 'b'), _relation('db1', 'c'))
+    assert _identifiers(cache, 'db1') == ['a', 'c']
+    cache.drop(_relation('db1', 'a'))
+    assert _identifiers(cache, 'db1') == ['c']
+    cache.drop_schema(None, 'db1')
+    assert _identifiers(cache, 'db1') == []
+    assert _identifiers(cache, 'db2') == ['a']
+    assert ('', 'db1') not in cache
+
+
+def test_references():
+    cache = ClickHouseRelationsCache()
+    for identifier in ('source', 'mv', 'other'):
+        cache.add(_relation('db1', identifier))
+    cache.add_link(_relation('db1', 'source'), _relation('db1', 'mv'))
+    cache.add_link(_relation('db1', 'source'), _relation('db2', 'not_cached'))
+    cache.rename(_relation('db1', 'mv'), _relation('db1', 'mv2'))
+    assert [r.identifier for r in cache.get_dependents(_relation('db1', 'source'))] == ['mv2']
+    # ClickHouse doesn't drop materialized views with their source table
+    cache.drop(_relation('db1', 'source'))
+    assert _identifiers(cache, 'db1') == ['mv2', 'other']
+    assert not cache.relations[('db1', 'mv2')].references
+
+
+def test_reference_cycle():
+    cache = ClickHouseRelationsCache()
+    for ix in range(5000):
+        cache.add(_relation('db1', f'table_{ix}'))
+    for ix in range(5000):
+        cache.add_link(
+            _relation('db1', f'table_{ix}'), _relation('db1', f'table_{(ix + 1) % 5000}')
+        )
+    assert len(cache.get_dependents(_relation('db1', 'table_0'))) == 4999
+
+
+def test_schema_lookup_benchmark():
+    cache = ClickHouseRelationsCache()
+    with cache.lock:
+        for ix in range(100_000):
+            cache._setdefault(CachedRelation(_relation(f'db{ix % 300}', f'table_{ix}')))
+    start = time.perf_counter()
+    for _ in range(1000):
+        relations = cache.get_relations(None, 'db5')
+    assert len(relations) == 334
+    cache.drop_schema(None, 'db7')
+    assert len(cache.relations) == 100_000 - 334
+    # A scan of every cached relation for each lookup takes well over a second
+    assert time.perf_counter() - start < 1
+
+
+def _build_relation(schema, identifier, attrs):
+    rel_type, can_exchange, can_on_cluster = attrs
+    return ClickHouseRelation.create(
+        database='',
+        schema=schema,
+        identifier=identifier,
+        type=rel_type,
+        can_exchange=can_exchange,
+        can_on_cluster=can_on_cluster,
+    )
+
+
+def _cached_memory(make_entry, count=20_000):
+    cache = ClickHouseRelationsCache()
+    tracemalloc.start()
+    try:
+        with cache.lock:
+            for ix in range(count):
+                cache._setdefault(make_entry(f'db{ix % 300}', f'table_{ix}'))
+        return cache, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_listed_relations_memory_benchmark():
+    attrs = (ClickHouseRelationType.Table, True, False)
+    _, built_size = _cached_memory(
+        lambda schema, identifier: CachedRelation(_build_relation(schema, identifier, attrs))
+    )
+    cache, listed_size = _cached_memory(
+        lambda schema, identifier: CachedRelation(
+            schema=schema, identifier=identifier, build=_build_relation, attrs=attrs
+        )
+    )
+    # About 1350 bytes per relation for built relations, and under 300 bytes for listed relations
+    assert listed_size * 3 < built_size
+
+    entry = cache.relations[('db5', 'table_5')]
+    assert not entry.is_built
+    relation = cache.get_cached_relation('db5', 'table_5')
+    assert entry.is_built and relation.can_exchange and relation.type == 'table'
+    assert cache.get_cached_relation('db5', 'table_5') is relation
+
+
+def test_concurrent_lookups_benchmark():
+    cache = ClickHouseRelationsCache()
+    for ix in range(1000):
+        cache.add(_relation(f'db{ix % 10}', f'table_{ix}'))
+    for ix in range(10):
+        cache.get_relations(None, f'db{ix}')
+    finished = []
+
+    def lookup(schema):
+        for _ in range(500):
+            assert len(cache.get_relations(None, schema)) == 100
+        finished.append(schema)
+
+    readers = [threading.Thread(target=lookup, args=(f'db{ix % 10}',)) for ix in range(64)]
+    start = time.perf_counter()
+    # Lookups of unchanged schemas don't wait for a writer holding the lock
+    with cache.lock:
+        cache.add(_relation('db_other', 'new_table'))
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join(timeout=10)
+    assert len(finished) == 64
+    assert time.perf_counter() - start < 5
+    assert _identifiers(cache, 'db_other') == ['new_table']
+
+
+def test_column_cache():
+    cache = ClickHouseRelationsCache()
+    relation = _relation('db1', 'model')
+    cache.set_columns(relation, ['id'], cache.columns_epoch)
+    assert cache.get_columns(relation) == ['id']
+    cache.invalidate_columns([(None, 'model')])
+    assert cache.get_columns(relation) is None
+
+    cache.set_columns(relation, ['id'], cache.columns_epoch)
+    cache.add(relation)
+    assert cache.get_columns(relation) is None
+
+    cache.set_columns(relation, ['id'], cache.columns_epoch)
+    cache.rename(relation, _relation('db1', 'model2'))
+    assert cache.get_columns(relation) is None
+
+    # columns read before an invalidation are not cached
+    epoch = cache.columns_epoch
+    cache.invalidate_columns([('db1', 'other')])
+    cache.set_columns(relation, ['id'], epoch)
+    assert cache.get_columns(relation) is None
+
+
+def test_database_catalog():
+    cache = ClickHouseRelationsCache()
+    assert cache.get_databases() is None
+    # changes before the catalog is loaded are ignored
+    cache.add_database(SimpleNamespace(name='db0', engine='Atomic'))
+    assert cache.get_databases() is None
+
+    cache.set_databases([SimpleNamespace(name='db1', engine='Atomic')], cache.databases_epoch)
+    cache.add_database(SimpleNamespace(name='db2', engine='Replicated'))
+    assert sorted(cache.get_databases()) == ['db1', 'db2']
+    cache.remove_database('db1')
+    assert sorted(cache.get_databases()) == ['db2']
+
+    # a catalog read before a change is not cached
+    cache.clear()
+    epoch = cache.databases_epoch
+    cache.remove_database('db2')
+    cache.set_databases([SimpleNamespace(name='db2', engine='Replicated')], epoch)
+    assert cache.get_databases() is None
+
+
+def test_looked_up_relations():
+    cache = ClickHouseRelationsCache()
+    cache.add_looked_up(_relation('external', 'source'))
+    assert cache.get_cached_relation('external', 'source').identifier == 'source'
+    # the schema isn't considered cached, so it can still be listed in full
+    assert ('', 'external') not in cache
+
+    cache.add_missing('external', 'other', cache.columns_epoch)
+    assert cache.is_missing('external', 'other')
+    cache.invalidate_columns([(None, 'other')])
+    assert not cache.is_missing('external', 'other')
+
+    cache.add_missing('external', 'other', cache.columns_epoch)
+    cache.add(_relation('external', 'other'))
+    assert not cache.is_missing('external', 'other')
+
+    # a relation found missing before a change is not remembered
+    epoch = cache.columns_epoch
+    cache.invalidate_columns([('external', 'another')])
+    cache.add_missing('external', 'another', epoch)
+    assert not cache.is_missing('external', 'another')
@@ -0,0 +1,74 @@
+import json
+import threading
+import time
+
+from dbt.adapters.clickhouse.capabilities import CapabilityRegistry, ServerCapabilities
+
+
+def _capabilities(**kwargs):
+    values = {
+        'server_version': '24.3.1',
+        'has_lw_deletes': True,
+        'use_lw_deletes': False,
+        'atomic_exchange': True,
+    }
+    values.update(kwargs)
+    return ServerCapabilities(**values)
+
+
+def test_probe_once_across_threads():
+    registry = CapabilityRegistry()
+    calls = []
+
+    def probe():
+        calls.append(1)
+        time.sleep(0.05)
+        return _capabilities()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get_or_probe('key', probe)))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 16
+    assert all(result is results[0] for result in results)
+
+
+def test_disk_cache_reused_within_ttl(tmp_path):
+    cache_path = str(tmp_path / 'capabilities.json')
+    CapabilityRegistry().get_or_probe(
+        'key', lambda: _capabilities(conn_settings={'setting': '1'}), cache_path, 60
+    )
+
+    def fail():
+        raise AssertionError('Probe should have been loaded from disk')
+
+    cached = CapabilityRegistry().get_or_probe('key', fail, cache_path, 60)
+    assert cached.atomic_exchange
+    assert cached.conn_settings == {'setting': '1'}
+
+
+def test_disk_cache_expired(tmp_path):
+    cache_path = tmp_path / 'capabilities.json'
+    expired = _capabilities(atomic_exchange=False, probed_at=time.time() - 120)
+    cache_path.write_text(json.dumps({'key': expired.__dict__}))
+    result = CapabilityRegistry().get_or_probe('key', _capabilities, str(cache_path), 60)
+    assert result.atomic_exchange
+
+
+def test_database_dropped():
+    registry = CapabilityRegistry()
+    registry.add_database('host|8123|default', 'db1')
+    registry.get_or_probe('host|8123|default|db1|24.3.1|False|True', _capabilities)
+    registry.database_dropped('db1')
+    assert not registry.database_ensured('host|8123|default', 'db1')
+    probed = []
+    registry.get_or_probe(
+        'host|8123|default|db1|24.3.1|False|True', lambda: probed.append(1) or _capabilities()
+    )
+    assert probed
@@ -0,0 +1,205 @@
+import datetime
+import decimal
+import threading
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from dbt.adapters.contracts.connection import Connection, ConnectionState, LazyHandle
+from dbt_common.clients.agate_helper import table_from_data_flat
+
+from dbt.adapters.clickhouse.cache import ClickHouseRelationsCache
+from dbt.adapters.clickhouse.connections import ClickHouseConnectionManager
+from dbt.adapters.clickhouse.dbclient import ChColumnarResult
+
+COLUMN_NAMES = ['id', 'score', 'price', 'name', 'parent', 'tags', 'ts', 'uuid', 'flag', 'addr']
+COLUMN_TYPES = [
+    'UInt64',
+    'Float64',
+    'Decimal(10, 2)',
+    'LowCardinality(Nullable(String))',
+    'Nullable(Int32)',
+    'Array(String)',
+    'DateTime',
+    'UUID',
+    'Bool',
+    'IPv4',
+]
+ROWS = [
+    (
+        1,
+        1.5,
+        decimal.Decimal('1.20'),
+        '',
+        None,
+        ['a'],
+        datetime.datetime(2024, 1, 1),
+        uuid.UUID(int=1),
+        True,
+        '10.0.0.1',
+    ),
+    (
+        2,
+        2.5,
+        decimal.Decimal('3.40'),
+        'null',
+        1,
+        [],
+        datetime.datetime(2024, 1, 2),
+        uuid.UUID(int=2),
+        False,
+        '10.0.0.2',
+    ),
+]
+
+
+def test_columnar_table_matches_row_table():
+    columns = [list(column) for column in zip(*ROWS)]
+    table = ClickHouseConnectionManager.get_table_from_response(
+        ChColumnarResult(COLUMN_NAMES, COLUMN_TYPES, columns)
+    )
+    expected = table_from_data_flat([dict(zip(COLUMN_NAMES, row)) for row in ROWS], COLUMN_NAMES)
+    assert table.column_names == expected.column_names
+    assert [type(t) for t in table.column_types] == [type(t) for t in expected.column_types]
+    assert [tuple(row) for row in table.rows] == [tuple(row) for row in expected.rows]
+
+
+def test_columnar_table_empty():
+    table = ClickHouseConnectionManager.get_table_from_response(
+        ChColumnarResult(['id', 'name'], ['Int32', 'String'], [[], []])
+    )
+    assert table.column_names == ('id', 'name')
+    assert len(table.rows) == 0
+
+
+def test_response_statistics():
+    client = SimpleNamespace(
+        last_query_stats={
+            'query_id': 'test_query',
+            'read_rows': 10,
+            'read_bytes': 800,
+            'written_rows': 5,
+            'result_rows': 0,
+            'elapsed': 0.25,
+        }
+    )
+    response = ClickHouseConnectionManager.get_response(client)
+    assert str(response) == 'OK'
+    assert response.query_id == 'test_query'
+    assert response.rows_affected == 5
+    assert response.to_dict()['read_bytes'] == 800
+    assert response.to_dict()['elapsed'] == 0.25
+
+
+class InsertClient:
+    def __init__(self, inserts, failures=0):
+        self.inserts = inserts
+        self.failures = failures
+        self.last_query_stats = {}
+        self.closed = False
+
+    def insert(self, table, column_names, column_types, columns, settings):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('connection reset')
+        self.inserts.append((threading.get_ident(), columns, settings))
+        self.last_query_stats = {'written_rows': len(columns[0]), 'written_bytes': 10}
+
+    def close(self):
+        self.closed = True
+
+
+class InsertPool:
+    def __init__(self, inserts):
+        self.inserts = inserts
+        self.released = []
+
+    def acquire(self):
+        return InsertClient(self.inserts)
+
+    def release(self, client):
+        self.released.append(client)
+
+
+def _insert_columns(client, **kwargs):
+    manager = object.__new__(ClickHouseConnectionManager)
+    conn = SimpleNamespace(name='seed', handle=client, credentials=SimpleNamespace(pool_size=4))
+    with patch.object(ClickHouseConnectionManager, 'get_thread_connection', return_value=conn):
+        return manager.insert_columns(
+            'db.seed', ['id', 'name'], ['UInt32', 'String'], [[1, 2, 3], ['a', 'b', 'c']], **kwargs
+        )
+
+
+def test_insert_chunks():
+    inserts = []
+    response = _insert_columns(InsertClient(inserts))
+    assert response.rows_affected == 3
+    assert inserts[0][1:] == ([[1, 2, 3], ['a', 'b', 'c']], None)
+
+    inserts.clear()
+    response = _insert_columns(
+        InsertClient(inserts, failures=1),
+        settings={'insert_quorum': 2},
+        batch_rows=2,
+        retries=1,
+    )
+    assert response.rows_affected == 3 and response.written_bytes == 20
+    assert [columns for _, columns, _ in inserts] == [[[1, 2], ['a', 'b']], [[3], ['c']]]
+    tokens = [settings.pop('insert_deduplication_token') for _, _, settings in inserts]
+    assert tokens[0].endswith('-0') and tokens[1] == tokens[0][:-1] + '1'
+    assert [settings for _, _, settings in inserts] == [{'insert_quorum': 2}] * 2
+
+
+def test_parallel_insert_chunks():
+    inserts = []
+    pool = InsertPool(inserts)
+    with patch('dbt.adapters.clickhouse.connections.get_client_pool', return_value=pool):
+        response = _insert_columns(None, batch_rows=1, insert_threads=2)
+    assert response.rows_affected == 3
+    assert sorted(columns[0][0] for _, columns, _ in inserts) == [1, 2, 3]
+    assert threading.get_ident() not in {thread for thread, _, _ in inserts}
+    assert 1 <= len(pool.released) <= 2
+
+
+def test_cancel_open_skips_released_connections():
+    opened = []
+    manager = object.__new__(ClickHouseConnectionManager)
+    manager.lock = threading.RLock()
+    manager.thread_connections = {
+        1: Connection(
+            type='clickhouse',
+            name='model_a',
+            state=ConnectionState.OPEN,
+            credentials=None,
+            handle=object(),
+        ),
+        2: Connection(
+            type='clickhouse',
+            name='model_b',
+            state=ConnectionState.INIT,
+            credentials=None,
+            handle=LazyHandle(lambda conn: opened.append(conn)),
+        ),
+    }
+    cancelled = []
+    with patch.object(ClickHouseConnectionManager, 'get_if_exists', return_value=None):
+        with patch.object(ClickHouseConnectionManager, 'cancel', side_effect=cancelled.append):
+            names = manager.cancel_open()
+    assert names == ['model_a', 'model_b']
+    assert [conn.name for conn in cancelled] == ['model_a']
+    assert not opened
+
+
+def test_database_ddl_invalidates_catalog():
+    cache = ClickHouseRelationsCache()
+    cache.set_databases([SimpleNamespace(name='db1', engine='Atomic')], cache.databases_epoch)
+    manager = object.__new__(ClickHouseConnectionManager)
+    manager.relations_cache = cache
+    client = SimpleNamespace(command=lambda sql: None, last_query_stats={})
+    conn = SimpleNamespace(name='model', handle=client)
+    with patch.object(ClickHouseConnectionManager, 'get_thread_connection', return_value=conn):
+        with patch.object(ClickHouseConnectionManager, '_add_query_comment', side_effect=str):
+            manager.add_query('create table db1.t (x Int32) engine Memory')
+            assert cache.get_databases() is not None
+            manager.add_query('create database if not exists db2')
+    assert cache.get_databases() is None
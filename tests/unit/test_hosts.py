@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import pytest
+from dbt_common.exceptions import DbtConfigError
+
+from dbt.adapters.clickhouse.credentials import ClickHouseCredentials
+from dbt.adapters.clickhouse.dbclient import ChRetryableException, get_db_client
+from dbt.adapters.clickhouse.hosts import HostSelector, parse_host
+
+HOSTS = [('ch1', 8123), ('ch2', 8123), ('ch3', 8123)]
+
+
+def test_parse_host():
+    assert parse_host('ch1', 8123) == ('ch1', 8123)
+    assert parse_host('ch1:9000', 8123) == ('ch1', 9000)
+    assert parse_host('[::1]:9000', 8123) == ('::1', 9000)
+    assert parse_host('::1', 8123) == ('::1', 8123)
+    with pytest.raises(DbtConfigError):
+        parse_host('ch1:http', 8123)
+
+
+def test_round_robin():
+    selector = HostSelector(HOSTS)
+    assert [selector.candidates()[0] for _ in range(4)] == HOSTS + HOSTS[:1]
+
+
+def test_least_connections():
+    selector = HostSelector(HOSTS, 'least_connections')
+    for _ in range(6):
+        selector.connected(selector.candidates()[0])
+    assert [selector.connection_count(host) for host in HOSTS] == [2, 2, 2]
+    selector.disconnected(HOSTS[1])
+    assert selector.candidates()[0] == HOSTS[1]
+
+
+def test_random():
+    selector = HostSelector(HOSTS, 'random')
+    assert sorted(selector.candidates()) == HOSTS
+
+
+def test_invalid_policy():
+    with pytest.raises(DbtConfigError):
+        HostSelector(HOSTS, 'fastest')
+
+
+def test_failed_host_tried_last():
+    selector = HostSelector(HOSTS)
+    with patch('time.monotonic', return_value=1000):
+        selector.failed(HOSTS[0])
+        assert selector.candidates() == [HOSTS[1], HOSTS[2], HOSTS[0]]
+    with patch('time.monotonic', return_value=1031):
+        assert selector.candidates()[0] == HOSTS[1]
+        assert HOSTS[0] in selector.candidates()[:2]
+
+
+class FakeClient:
+    def __init__(self, credentials):
+        self.host = credentials.host
+        self.on_close = None
+
+
+def test_failover():
+    credentials = ClickHouseCredentials(
+        schema='default', hosts=['ch1', 'ch2:8124'], cluster='test_cluster'
+    )
+
+    def create(host_credentials):
+        if host_credentials.host == 'ch1':
+            raise ChRetryableException('Connection refused')
+        assert host_credentials.port == 8124
+        return FakeClient(host_credentials)
+
+    with patch('dbt.adapters.clickhouse.dbclient._create_db_client', side_effect=create):
+        client = get_db_client(credentials)
+        assert client.host == 'ch2'
+        # ch1 is skipped while it is in the failure cooldown
+        assert get_db_client(credentials).host == 'ch2'
+        client.on_close()
+        with patch('dbt.adapters.clickhouse.dbclient._create_db_client') as create_mock:
+            create_mock.side_effect = ChRetryableException('Connection refused')
+            with pytest.raises(ChRetryableException):
+                get_db_client(credentials)
+
+
+def test_multi_host_requires_replicated_ddl():
+    with pytest.raises(DbtConfigError):
+        ClickHouseCredentials(schema='default', hosts=['ch1', 'ch2'])
+    ClickHouseCredentials(schema='default', hosts=['ch1'])
+    ClickHouseCredentials(schema='default', hosts=['ch1', 'ch2'], cluster='test_cluster')
+    ClickHouseCredentials(schema='default', hosts=['ch1', 'ch2'], database_engine='Replicated')
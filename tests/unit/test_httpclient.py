@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+
+from clickhouse_connect.driver.summary import QuerySummary
+
+from dbt.adapters.clickhouse.httpclient import ChHttpClient
+from dbt.adapters.clickhouse.settings import LW_DELETE_SETTING, ServerSettings
+
+
+class FakeStream:
+    def __init__(self, blocks):
+        self.source = SimpleNamespace(
+            column_names=('id', 'name'),
+            column_types=(SimpleNamespace(name='UInt32'), SimpleNamespace(name='String')),
+            query_id='test_query',
+            summary={'read_rows': '7', 'read_bytes': '120', 'elapsed_ns': '2000000'},
+        )
+        self.blocks = blocks
+        self.read = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.closed = True
+
+    def __iter__(self):
+        for block in self.blocks:
+            self.read += 1
+            yield block
+
+
+def _client(stream):
+    client = ChHttpClient.__new__(ChHttpClient)
+    client.use_session = True
+    client._client = SimpleNamespace(query_column_block_stream=lambda sql, **kwargs: stream)
+    return client
+
+
+BLOCKS = [[[1, 2, 3], ['a', 'b', 'c']], [[4, 5, 6], ['d', 'e', 'f']], [[7], ['g']]]
+
+
+def test_query_columns_unlimited():
+    stream = FakeStream(BLOCKS)
+    result = _client(stream).query_columns('SELECT 1')
+    assert result.column_types == ['UInt32', 'String']
+    assert result.columns == [[1, 2, 3, 4, 5, 6, 7], ['a', 'b', 'c', 'd', 'e', 'f', 'g']]
+    assert not result.truncated and stream.closed
+
+
+def test_query_columns_stats():
+    client = _client(FakeStream(BLOCKS))
+    client.query_columns('SELECT 1')
+    assert client.last_query_stats == {
+        'query_id': 'test_query',
+        'read_rows': 7,
+        'read_bytes': 120,
+        'elapsed': 0.002,
+    }
+
+
+def test_query_columns_max_rows():
+    stream = FakeStream(BLOCKS)
+    result = _client(stream).query_columns('SELECT 1', max_rows=4)
+    assert result.columns == [[1, 2, 3, 4], ['a', 'b', 'c', 'd']]
+    assert result.truncated
+    assert stream.read == 2 and stream.closed
+
+
+def test_query_columns_max_rows_block_boundary():
+    result = _client(FakeStream(BLOCKS[:2])).query_columns('SELECT 1', max_rows=6)
+    assert len(result.columns[0]) == 6 and not result.truncated
+    result = _client(FakeStream(BLOCKS)).query_columns('SELECT 1', max_rows=6)
+    assert len(result.columns[0]) == 6 and result.truncated
+
+
+def test_kill_query():
+    commands = []
+
+    def command(sql, **kwargs):
+        commands.append((sql, kwargs['settings']['query_id']))
+        return QuerySummary({})
+
+    client = ChHttpClient.__new__(ChHttpClient)
+    client.use_session = True
+    client._client = SimpleNamespace(command=command)
+    client.kill_query('abc', 'test_cluster', sync=True)
+    client.kill_query('abc', '')
+    assert commands[0][0] == "KILL QUERY ON CLUSTER \"test_cluster\" WHERE query_id = 'abc' SYNC"
+    assert commands[1][0] == "KILL QUERY WHERE query_id = 'abc' ASYNC"
+    assert commands[0][1] != commands[1][1]
+    assert client.running_query_id is None
+
+
+def test_enable_setting_without_session():
+    commands = []
+    client_settings = {}
+    client = ChHttpClient.__new__(ChHttpClient)
+    client.use_session = False
+    client._conn_settings = {}
+    client.server_settings = ServerSettings(lambda names: {})
+    client._client = SimpleNamespace(
+        command=lambda sql, **kwargs: commands.append((sql, kwargs['settings'])) or 1,
+        set_client_setting=client_settings.__setitem__,
+    )
+    client._enable_setting(LW_DELETE_SETTING)
+    assert commands[0][0] == 'SELECT 1'
+    assert commands[0][1][LW_DELETE_SETTING] == '1'
+    assert client_settings == {LW_DELETE_SETTING: '1'}
+    assert client.server_settings.get_bool(LW_DELETE_SETTING)
+
+
+def test_session_required_statements():
+    commands = []
+    client_settings = {}
+    client = ChHttpClient.__new__(ChHttpClient)
+    client.use_session = False
+    client._conn_settings = {}
+    client._client = SimpleNamespace(
+        command=lambda sql, **kwargs: commands.append((sql, client_settings.get('session_id'))),
+        set_client_setting=client_settings.__setitem__,
+    )
+    client.command('CREATE TABLE t (id UInt8) ENGINE Memory')
+    client.command('/* {"app": "dbt"} */\n  set allow_experimental_object_type = 1')
+    client.command('create temporary table tmp (id UInt8)')
+    assert commands[0][1] is None
+    assert commands[1][1].startswith('dbt::')
+    assert commands[2][1] == commands[1][1]
+    assert client.use_session and client._conn_settings['session_id'] == commands[1][1]
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+# Generous budget (in microseconds) for the self import time of the adapter's own modules.
+# The adapter is imported by every dbt command, including `dbt parse` and `dbt ls`
+ADAPTER_IMPORT_BUDGET = 100_000
+
+# Modules only needed to run queries or build result tables, which should not be imported
+# until they are used
+DEFERRED_MODULES = ('clickhouse_connect', 'clickhouse_driver', 'agate', 'pkg_resources')
+
+
+def _import_times():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import dbt.adapters.clickhouse'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, _, module = line[len('import time:') :].split('|')
+        times[module.strip()] = int(self_time)
+    return times
+
+
+def test_adapter_import_time():
+    times = _import_times()
+    for module in DEFERRED_MODULES:
+        assert not any(
+            name == module or name.startswith(f'{module}.') for name in times
+        ), f'{module} should not be imported when the adapter is loaded'
+    adapter_time = sum(
+        self_time
+        for module, self_time in times.items()
+        if module.startswith(('dbt.adapters.clickhouse', 'dbt.include.clickhouse'))
+    )
+    assert adapter_time < ADAPTER_IMPORT_BUDGET
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from dbt.adapters.clickhouse.nativeclient import ChNativeClient
+
+COLUMN_TYPES = [('id', 'UInt32'), ('name', 'String')]
+
+
+class FakeDriverClient:
+    def __init__(self, rows, column_types=COLUMN_TYPES):
+        self.rows = rows
+        self.column_types = column_types
+        self.last_query = None
+        self.cancelled = False
+        self.columnar = None
+
+    def execute(self, sql, with_column_types=False, columnar=False, **kwargs):
+        self.columnar = columnar
+        if not self.rows:
+            return [], []
+        data = [tuple(column) for column in zip(*self.rows)] if columnar else self.rows
+        return data, self.column_types
+
+    def execute_iter(self, sql, with_column_types=False, **kwargs):
+        if not self.rows:
+            return
+        yield self.column_types
+        yield from self.rows
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def _client(driver_client):
+    client = ChNativeClient.__new__(ChNativeClient)
+    client._client = driver_client
+    client.running_query_id = None
+    return client
+
+
+ROWS = [(1, 'a'), (2, 'b'), (3, 'c')]
+
+
+def test_query_columns_columnar():
+    driver_client = FakeDriverClient(ROWS)
+    result = _client(driver_client).query_columns('SELECT 1')
+    assert driver_client.columnar
+    assert result.column_names == ['id', 'name']
+    assert result.columns == [(1, 2, 3), ('a', 'b', 'c')]
+    assert not result.truncated
+
+
+def test_query_columns_limited():
+    driver_client = FakeDriverClient(ROWS)
+    result = _client(driver_client).query_columns('SELECT 1', max_rows=2)
+    assert result.columns == [[1, 2], ['a', 'b']]
+    assert result.truncated and driver_client.cancelled
+
+
+def test_query_columns_no_data_block():
+    insert_sql = 'INSERT INTO dest SELECT * FROM source'
+    for max_rows in (None, 10):
+        client = _client(FakeDriverClient([]))
+        result = client.query_columns(insert_sql, max_rows=max_rows)
+        assert result.column_names == [] and result.columns == []
+        assert not result.truncated
+        assert client.last_query_stats['query_id']
+
+
+def test_query_columns_stats():
+    driver_client = FakeDriverClient(ROWS)
+    driver_client.last_query = SimpleNamespace(
+        progress=SimpleNamespace(rows=3, bytes=60, written_rows=0, written_bytes=0),
+        elapsed=0.5,
+    )
+    client = _client(driver_client)
+    client.query_columns('SELECT 1')
+    assert client.last_query_stats['read_rows'] == 3
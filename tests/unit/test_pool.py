@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from dbt.adapters.clickhouse.pool import ChClientPool
+
+
+class FakeClient:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+        self.pings = 0
+
+    def ping(self):
+        self.pings += 1
+        return self.alive
+
+    def close(self):
+        self.closed = True
+
+
+def test_release_and_reuse():
+    created = []
+    pool = ChClientPool(lambda: created.append(FakeClient()) or created[-1], 2, 60)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(created) == 1
+    assert first.pings == 0
+
+
+def test_max_idle():
+    pool = ChClientPool(FakeClient, 1, 60)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert len(pool) == 1
+    assert second.closed and not first.closed
+
+
+def test_idle_eviction():
+    pool = ChClientPool(FakeClient, 2, 60)
+    client = pool.acquire()
+    with patch('time.monotonic', return_value=1000):
+        pool.release(client)
+    with patch('time.monotonic', return_value=1061):
+        assert pool.acquire() is not client
+    assert client.closed
+
+
+def test_liveness_ping():
+    pool = ChClientPool(FakeClient, 2, 60, ping_interval=5)
+    dead = pool.acquire()
+    dead.alive = False
+    with patch('time.monotonic', return_value=1000):
+        pool.release(dead)
+    with patch('time.monotonic', return_value=1010):
+        replacement = pool.acquire()
+    assert replacement is not dead
+    assert dead.pings == 1 and dead.closed
+
+
+def test_close_all():
+    pool = ChClientPool(FakeClient, 2, 60)
+    client = pool.acquire()
+    pool.release(client)
+    pool.close_all()
+    assert client.closed and len(pool) == 0
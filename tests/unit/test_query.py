@@ -0,0 +1,28 @@
+from dbt.adapters.clickhouse.query import ddl_target_relations, is_database_ddl
+
+
+def test_ddl_target_relations():
+    assert ddl_target_relations('select 1') is None
+    assert ddl_target_relations('insert into db.t values (1)') is None
+    assert ddl_target_relations('CREATE USER test_user') is None
+    assert ddl_target_relations(
+        '/* {"app": "dbt"} */\nalter table `db`.`t` add column x Int32'
+    ) == {('db', 't')}
+    assert ddl_target_relations('create table if not exists db.t (x Int32)') == {('db', 't')}
+    assert ddl_target_relations('-- comment\ncreate or replace view v as select 1') == {(None, 'v')}
+    assert ddl_target_relations('drop table if exists `db`.`t\\`x` ON CLUSTER "c" SYNC') == {
+        ('db', 't`x')
+    }
+    assert ddl_target_relations('exchange tables db.a and db.b') == {('db', 'a'), ('db', 'b')}
+    assert ddl_target_relations('rename table db.a to db.b') == {('db', 'a'), ('db', 'b')}
+    # the affected relations are unknown
+    assert ddl_target_relations('rename table a to b, c to d') == set()
+    assert ddl_target_relations('drop database db') == set()
+
+
+def test_is_database_ddl():
+    assert is_database_ddl('/* {"app": "dbt"} */\ncreate database if not exists db')
+    assert is_database_ddl('DROP DATABASE IF EXISTS `db` ON CLUSTER c SYNC')
+    assert is_database_ddl('rename database a to b')
+    assert not is_database_ddl('create table db.t (x Int32)')
+    assert not is_database_ddl('select 1')
@@ -0,0 +1,28 @@
+from dbt.adapters.clickhouse.relation_store import RelationStore, SchemaSnapshot
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'target' / 'relations.json')
+    relation = {
+        'identifier': 'model',
+        'type': 'table',
+        'can_exchange': True,
+        'can_on_cluster': False,
+    }
+    RelationStore(path, 'key').save({'db1': SchemaSnapshot('2024-01-01 00:00:00|1', [relation])})
+    snapshots = RelationStore(path, 'key').load()
+    assert snapshots['db1'].signature == '2024-01-01 00:00:00|1'
+    assert snapshots['db1'].relations == [relation]
+
+
+def test_key_mismatch(tmp_path):
+    path = str(tmp_path / 'relations.json')
+    RelationStore(path, 'key').save({'db1': SchemaSnapshot('2024-01-01 00:00:00|0')})
+    assert RelationStore(path, 'other_key').load() == {}
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / 'relations.json'
+    path.write_text('[1, 2')
+    assert RelationStore(str(path), 'key').load() == {}
+    assert RelationStore(str(tmp_path / 'missing.json'), 'key').load() == {}
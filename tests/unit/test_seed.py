@@ -0,0 +1,216 @@
+import datetime
+import decimal
+import tracemalloc
+import uuid
+from zoneinfo import ZoneInfo
+
+import pytest
+from dbt_common.clients.agate_helper import table_from_data_flat
+from dbt_common.exceptions import DbtConfigError, DbtRuntimeError
+
+from dbt.adapters.clickhouse.datatype import parse_type
+from dbt.adapters.clickhouse.seed import (
+    arrow_file_columns,
+    comment_seed_hash,
+    compute_seed_hash,
+    csv_record_blocks,
+    file_blocks,
+    format_seed_hash_comment,
+    sample_csv_table,
+    seed_columns,
+    seed_input_format,
+)
+
+UTC = datetime.timezone.utc
+
+
+def _seed_table(rows):
+    return table_from_data_flat(rows, list(rows[0].keys()))
+
+
+def test_seed_columns():
+    table = _seed_table(
+        [
+            {'id': 1, 'name': 'a', 'amount': 1.25, 'flag': True, 'day': '2024-01-02'},
+            {'id': 2, 'name': None, 'amount': None, 'flag': None, 'day': None},
+        ]
+    )
+    types = [
+        parse_type('UInt64'),
+        parse_type('LowCardinality(Nullable(String))'),
+        parse_type('Decimal(10, 2)'),
+        parse_type('Bool'),
+        parse_type('Date'),
+    ]
+    columns = seed_columns(table, types, UTC)
+    assert columns == [
+        [1, 2],
+        ['a', None],
+        [decimal.Decimal('1.25'), decimal.Decimal(0)],
+        [True, False],
+        [datetime.date(2024, 1, 2), datetime.date(1970, 1, 1)],
+    ]
+
+
+def test_seed_datetimes():
+    table = _seed_table([{'ts': '2024-01-02 03:04:05', 'ts_local': '2024-01-02 03:04:05'}])
+    types = [parse_type("DateTime64(3, 'UTC')"), parse_type('DateTime')]
+    server_tz = ZoneInfo('America/Denver')
+    ts, ts_local = seed_columns(table, types, server_tz)
+    assert ts[0] == datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('UTC'))
+    assert ts_local[0].tzinfo is server_tz
+    assert ts_local[0].utcoffset() == datetime.timedelta(hours=-7)
+
+
+def test_seed_strings_and_uuids():
+    value = uuid.uuid4()
+    table = _seed_table([{'code': 12, 'key': str(value)}])
+    columns = seed_columns(table, [parse_type('String'), parse_type('UUID')], UTC)
+    assert columns == [['12'], [value]]
+
+
+def test_unsupported_seed_types():
+    table = _seed_table([{'tags': '[1,2]'}])
+    assert seed_columns(table, [parse_type('Array(UInt8)')], UTC) is None
+
+
+def test_invalid_seed_value():
+    table = _seed_table([{'id': 'abc'}])
+    with pytest.raises(DbtRuntimeError, match='seed column id'):
+        seed_columns(table, [parse_type('Int32')], UTC)
+
+
+def test_sample_csv_table(tmp_path):
+    path = tmp_path / 'seed.csv'
+    path.write_text('﻿id;name;day\n1;a;2024-01-02\n2;;2024-01-03\n3.5;c;\n', encoding='utf-8')
+    table = sample_csv_table(str(path), ';', ['name'], 2)
+    assert table.column_names == ('id', 'name', 'day')
+    assert len(table.rows) == 2
+    assert [type(t).__name__ for t in table.column_types] == ['Number', 'Text', 'Date']
+
+
+def test_file_blocks(tmp_path):
+    path = tmp_path / 'seed.csv'
+    path.write_bytes(b'\xef\xbb\xbfid,name\n1,a\n2,b\n')
+    assert b''.join(file_blocks(str(path), 8)) == b'id,name\n1,a\n2,b\n'
+
+
+def test_csv_record_blocks(tmp_path):
+    path = tmp_path / 'seed.csv'
+    path.write_text('id,note\n1,"two\nlines"\n\n2,plain\n3,"a ""quoted"", value"\n')
+    blocks = list(csv_record_blocks(str(path), block_size=10))
+    assert blocks == ['1,"two\nlines"\n', '2,plain\n3,"a ""quoted"", value"\n']
+    assert list(csv_record_blocks(str(path), skip_header=False))[0].startswith('id,note\n1,')
+
+
+def test_seed_blocks_memory(tmp_path):
+    path = tmp_path / 'seed.csv'
+    with open(path, 'w') as f:
+        f.write('id,name,value\n')
+        for ix in range(100000):
+            f.write(f'{ix},"name {ix}",{ix * 1.5}\n')
+    tracemalloc.start()
+    try:
+        blocks = sum(1 for _ in csv_record_blocks(str(path), block_size=1 << 16))
+        assert sum(len(block) for block in file_blocks(str(path), 1 << 16)) == path.stat().st_size
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert blocks > 10
+    # A 2.5MB file is read with a few blocks in memory at a time
+    assert peak < 1 << 20
+
+
+def test_seed_hash(tmp_path):
+    path = tmp_path / 'seed.csv'
+    path.write_text('id,name\n1,a\n')
+    load_config = {'column_types': {'id': 'UInt8'}, 'delimiter': ','}
+    seed_hash = compute_seed_hash(str(path), load_config)
+    assert seed_hash == compute_seed_hash(str(path), dict(reversed(load_config.items())))
+    assert seed_hash != compute_seed_hash(str(path), {**load_config, 'column_types': {}})
+    path.write_text('id,name\n1,b\n')
+    assert seed_hash != compute_seed_hash(str(path), load_config)
+
+    comment = format_seed_hash_comment('Seed\nwith two lines', seed_hash)
+    assert comment_seed_hash(comment) == seed_hash
+    assert comment_seed_hash(format_seed_hash_comment(None, seed_hash)) == seed_hash
+    assert comment_seed_hash('Seed\nwith two lines') is None
+    assert comment_seed_hash(None) is None
+
+
+def test_seed_input_format(tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.ipc
+
+    table = pyarrow.table({'id': [1, 2]})
+    with pyarrow.ipc.new_file(str(tmp_path / 'file.arrow'), table.schema) as writer:
+        writer.write_table(table)
+    with pyarrow.ipc.new_stream(str(tmp_path / 'stream.arrow'), table.schema) as writer:
+        writer.write_table(table)
+    assert seed_input_format(str(tmp_path / 'seed.CSV')) == 'CSVWithNames'
+    assert seed_input_format(str(tmp_path / 'seed.parquet')) == 'Parquet'
+    assert seed_input_format(str(tmp_path / 'file.arrow')) == 'Arrow'
+    assert seed_input_format(str(tmp_path / 'stream.arrow')) == 'ArrowStream'
+    assert seed_input_format(str(tmp_path / 'seed.arrows')) == 'ArrowStream'
+    with pytest.raises(DbtConfigError):
+        seed_input_format(str(tmp_path / 'seed.json'))
+
+
+def test_arrow_file_columns(tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    schema = pyarrow.schema(
+        [
+            pyarrow.field('id', pyarrow.int64(), nullable=False),
+            pyarrow.field('name', pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+            pyarrow.field('tags', pyarrow.list_(pyarrow.string())),
+            pyarrow.field('attrs', pyarrow.map_(pyarrow.string(), pyarrow.int32())),
+            pyarrow.field(
+                'point',
+                pyarrow.struct(
+                    [
+                        pyarrow.field('x', pyarrow.float64(), nullable=False),
+                        pyarrow.field('y z', pyarrow.float32()),
+                    ]
+                ),
+            ),
+            pyarrow.field('amount', pyarrow.decimal128(10, 2)),
+            pyarrow.field('ts', pyarrow.timestamp('us', tz='UTC'), nullable=False),
+            pyarrow.field('day', pyarrow.date32()),
+        ]
+    )
+    expected = [
+        ('id', 'Int64'),
+        ('name', 'LowCardinality(Nullable(String))'),
+        ('tags', 'Array(Nullable(String))'),
+        ('attrs', 'Map(String, Nullable(Int32))'),
+        ('point', 'Tuple(`x` Float64, `y z` Nullable(Float32))'),
+        ('amount', 'Nullable(Decimal(10, 2))'),
+        ('ts', "DateTime64(6, 'UTC')"),
+        ('day', 'Nullable(Date32)'),
+    ]
+    parquet_path = str(tmp_path / 'seed.parquet')
+    pyarrow.parquet.write_table(schema.empty_table(), parquet_path)
+    arrow_path = str(tmp_path / 'seed.arrow')
+    with pyarrow.ipc.new_file(arrow_path, schema) as writer:
+        writer.write_table(schema.empty_table())
+    assert arrow_file_columns(arrow_path, 'Arrow', {}) == expected
+    for name, ch_type in expected:
+        assert str(parse_type(ch_type)) == ch_type
+
+    columns = dict(arrow_file_columns(parquet_path, 'Parquet', {'name': 'String'}))
+    assert list(columns) == [name for name, _ in expected]
+    assert columns['name'] == 'String'
+    assert columns['point'] == 'Tuple(`x` Float64, `y z` Nullable(Float32))'
+
+    stream_path = str(tmp_path / 'seed.arrows')
+    schema = pyarrow.schema([pyarrow.field('value', pyarrow.null())])
+    with pyarrow.ipc.new_stream(stream_path, schema) as writer:
+        writer.write_table(schema.empty_table())
+    with pytest.raises(DbtRuntimeError, match='column_types'):
+        arrow_file_columns(stream_path, 'ArrowStream', {})
+    assert arrow_file_columns(stream_path, 'ArrowStream', {'value': 'Nullable(String)'}) == [
+        ('value', 'Nullable(String)')
+    ]
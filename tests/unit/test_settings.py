@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from dbt.adapters.clickhouse.capabilities import ServerCapabilities
+from dbt.adapters.clickhouse.credentials import ClickHouseCredentials
+from dbt.adapters.clickhouse.nativeclient import ChNativeClient
+from dbt.adapters.clickhouse.settings import (
+    LW_DELETE_SETTING,
+    SNAPSHOT_SETTINGS,
+    ChSetting,
+    ServerSettings,
+)
+
+
+class FakeLoader:
+    def __init__(self, settings):
+        self.settings = settings
+        self.calls = []
+
+    def __call__(self, names):
+        names = tuple(names)
+        self.calls.append(names)
+        return {name: self.settings[name] for name in names if name in self.settings}
+
+
+def test_snapshot_loaded_once():
+    loader = FakeLoader({LW_DELETE_SETTING: ChSetting('1'), 'mutations_sync': ChSetting('2')})
+    settings = ServerSettings(loader)
+    assert settings.get_bool(LW_DELETE_SETTING)
+    assert settings.get_int('mutations_sync') == 2
+    assert settings.get('insert_distributed_sync') is None
+    assert loader.calls == [SNAPSHOT_SETTINGS]
+
+
+def test_missing_setting_loaded_once():
+    loader = FakeLoader({'max_threads': ChSetting('8', readonly=True)})
+    settings = ServerSettings(loader)
+    assert settings.get_str('max_threads') == '8'
+    assert settings.is_readonly('max_threads')
+    assert settings.get_str('unknown_setting', 'default') == 'default'
+    assert settings.get('unknown_setting') is None
+    assert loader.calls == [SNAPSHOT_SETTINGS, ('max_threads',), ('unknown_setting',)]
+
+
+def test_update():
+    settings = ServerSettings(FakeLoader({LW_DELETE_SETTING: ChSetting('0', readonly=True)}))
+    assert not settings.get_bool(LW_DELETE_SETTING)
+    settings.update(LW_DELETE_SETTING, '1')
+    assert settings.get_bool(LW_DELETE_SETTING)
+    assert settings.is_readonly(LW_DELETE_SETTING)
+
+
+def test_update_before_load():
+    loader = FakeLoader({LW_DELETE_SETTING: ChSetting('0', readonly=True)})
+    settings = ServerSettings(loader)
+    settings.update(LW_DELETE_SETTING, '1')
+    settings.update('max_threads', '4')
+    assert loader.calls == []
+    assert settings.get_bool(LW_DELETE_SETTING)
+    assert settings.is_readonly(LW_DELETE_SETTING)
+    assert settings.get_int('max_threads') == 4
+    assert loader.calls == [SNAPSHOT_SETTINGS]
+
+
+def test_cached_capabilities_load_no_settings():
+    queries = []
+    driver_client = SimpleNamespace(
+        settings={}, execute=lambda sql, *args, **kwargs: queries.append(sql) or []
+    )
+    capabilities = ServerCapabilities(
+        '24.8.1', True, True, True, conn_settings={LW_DELETE_SETTING: '1'}
+    )
+    with (
+        patch.object(ChNativeClient, '_create_client', return_value=driver_client),
+        patch.object(ChNativeClient, '_server_version', return_value='24.8.1'),
+        patch.object(ChNativeClient, '_ensure_database'),
+        patch(
+            'dbt.adapters.clickhouse.dbclient.capability_registry.get_or_probe',
+            return_value=capabilities,
+        ),
+    ):
+        client = ChNativeClient(ClickHouseCredentials(schema='default'))
+    assert driver_client.settings == {LW_DELETE_SETTING: '1'}
+    assert not any('system.settings' in sql for sql in queries)
+    assert client.server_settings.get_bool(LW_DELETE_SETTING)
+    assert len(queries) == 1
@@ -1,6 +1,9 @@
+import json
 from unittest.mock import patch
 
-from dbt.adapters.clickhouse.util import compare_versions, hide_stack_trace
+import pytest
+
+from dbt.adapters.clickhouse.util import atomic_write_json, compare_versions, hide_stack_trace
 
 
 def test_is_before_version():
@@ -29,3 +32,17 @@ def test_hide_stack_trace_env_var_set():
         exception = Exception("Error occurred\nStack trace details follow...")
         result = hide_stack_trace(exception)
         assert result == "Error occurred"
+
+
+def test_atomic_write_json(tmp_path):
+    path = tmp_path / 'cache' / 'data.json'
+    atomic_write_json(str(path), {'a': [1, 2]})
+    atomic_write_json(str(path), {'b': 3})
+    assert json.loads(path.read_text()) == {'b': 3}
+    assert [p.name for p in path.parent.iterdir()] == ['data.json']
+
+    with patch('json.dump', side_effect=OSError('disk full')):
+        with pytest.raises(OSError):
+            atomic_write_json(str(path), {'c': 4})
+    assert json.loads(path.read_text()) == {'b': 3}
+    assert [p.name for p in path.parent.iterdir()] == ['data.json']